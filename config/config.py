@@ -13,8 +13,11 @@ class DatabaseConfig:
     DB_NAME = os.getenv('DB_NAME')
     DB_USER = os.getenv('DB_USER')
     DB_PASSWORD = os.getenv('DB_PASSWORD')
+    DB_DRIVER = os.getenv('DB_DRIVER', 'ODBC Driver 18 for SQL Server')
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '5'))
+    DSN = None  # ODBC connection string, built once below
 
-
+    @staticmethod
     def validate():
         if not DatabaseConfig.DB_HOST:
             raise ValueError("DB_HOST is not set in environment variables.")
@@ -23,4 +26,18 @@ class DatabaseConfig:
         if not DatabaseConfig.DB_USER:
             raise ValueError("DB_USER is not set in environment variables.")
         if not DatabaseConfig.DB_PASSWORD:
-            raise ValueError("DB_PASSWORD is not set in environment variables.")
\ No newline at end of file
+            raise ValueError("DB_PASSWORD is not set in environment variables.")
+
+
+# Environment is loaded once, so the connection string never changes at runtime.
+# Validation stays lazy (first new connection) so importing the package without DB
+# settings, e.g. for test collection, still works.
+DatabaseConfig.DSN = (
+    f"DRIVER={{{DatabaseConfig.DB_DRIVER}}};"
+    f"SERVER={DatabaseConfig.DB_HOST};"
+    f"DATABASE={DatabaseConfig.DB_NAME};"
+    f"UID={DatabaseConfig.DB_USER};"
+    f"PWD={DatabaseConfig.DB_PASSWORD};"
+    f"Encrypt=yes;"
+    f"TrustServerCertificate=yes"
+)
@@ -10,6 +10,34 @@ from abc import ABC, abstractmethod
 
 logger = logging.getLogger('sp_validation')
 
+# Optional faster JSON parsers, best first; the standard library is the fallback
+try:
+    import orjson as _fast_json
+except ImportError:
+    try:
+        import ujson as _fast_json
+    except ImportError:
+        _fast_json = None
+
+
+def read_json(file_path: str) -> Any:
+    """Parse a JSON file with the fastest available parser (orjson, ujson, then json).
+    
+    Args:
+        file_path: Path to the JSON file
+        
+    Returns:
+        Parsed JSON document
+        
+    Raises:
+        ValueError: If the file is not valid JSON (json.JSONDecodeError for orjson/json)
+    """
+    if _fast_json is not None:
+        with open(file_path, 'rb') as f:
+            return _fast_json.loads(f.read())
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
 
 class BaseLoader(ABC):
     """Abstract base class for data loaders."""
@@ -71,11 +99,10 @@ class JSONLoader(BaseLoader):
             raise FileNotFoundError(f"Test data file not found: {file_path}")
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = read_json(file_path)
             logger.info(f"Successfully loaded test data from {file_path}")
             return data
-        except json.JSONDecodeError as e:
+        except ValueError as e:
             logger.error(f"JSON parsing error in {file_path}: {e}")
             raise
         except Exception as e:
@@ -1,38 +1,73 @@
 """SP Chain Executor - Execute chained stored procedures with parameter inheritance."""
 
 from typing import Dict, List, Any
+from types import MappingProxyType
 import logging
-import copy
+import traceback
+from database_layer.procedure_executor import (
+    run_stored_procedure, run_stored_procedure_batch, run_stored_procedure_with_session
+)
 
 logger = logging.getLogger('sp_validation')
 
+_SEPARATOR = "\n" + "=" * 80
+
+# SQL Server accepts at most 2100 parameters per request; keep batches below that
+_MAX_BATCH_PARAMS = 2000
+
+
+def _freeze(value):
+    """Return an immutable equivalent of a container value (scalars pass through)."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, set):
+        return frozenset(value)
+    return value
+
 
 class SPChainExecutor:
     """Execute chained SPs with parameter inheritance and overrides."""
     
-    def __init__(self, connection, operation=None):
+    def __init__(self, connection, operation=None, batch_independent_steps=False, session=None):
         """Initialize chain executor.
         
         Args:
             connection: Database connection
             operation: Optional operation name (e.g., 'Create', 'Edit') for filtering steps
+            batch_independent_steps: If True, send consecutive steps that don't consume
+                each other's outputs to the server in one round-trip. Every step of a
+                batch runs even if an earlier one in it fails, so only enable this
+                inside a transaction that will be rolled back on failure.
+            session: Optional open DBSession that every step runs on; without one
+                each SP call borrows its own session
         """
         self.connection = connection
+        self.session = session
         self.execution_results = {}
         self.chain_data = {}
         self.base_parameters = {}
         self.logger_callback = None
         self.operation = operation
+        self.batch_independent_steps = batch_independent_steps
     
     def set_logger(self, callback):
         """Set a callback for logging detailed output to stdout."""
         self.logger_callback = callback
     
-    def _log(self, msg):
-        """Log a message to both internal logger and callback (stdout)."""
-        logger.debug(msg)
+    def _log(self, msg, *args):
+        """Log a message to both internal logger and callback (stdout).
+        
+        Args are %-formatted lazily, only when the message is actually emitted.
+        """
+        logger.debug(msg, *args)
         if self.logger_callback:
-            self.logger_callback(msg)
+            self.logger_callback(msg % args if args else msg)
+    
+    def _verbose(self):
+        """True if detailed _log output will reach the callback or the debug log."""
+        return self.logger_callback is not None or logger.isEnabledFor(logging.DEBUG)
     
     def execute_chain(self, chain_config: List[Dict[str, Any]], execution_context: Dict[str, Any] = None) -> Dict[str, Any]:
         """Execute chained SPs with smart parameter inheritance.
@@ -42,6 +77,7 @@ class SPChainExecutor:
         - Stops on first failure and reports error clearly
         - Supports execution_context chaining for dependent operations
         - Supports operation filtering via operation_filter field in steps
+        - Optionally batches independent steps into one round-trip (batch_independent_steps)
         
         Args:
             chain_config: List of step configurations
@@ -54,7 +90,10 @@ class SPChainExecutor:
             # Initialize chain_data with execution_context (for operation chaining)
             if execution_context:
                 self.chain_data = execution_context.copy()
-                logger.info(f"Initialized chain_data with execution_context: {self.chain_data}")
+                logger.info("Initialized chain_data with execution_context: %s", self.chain_data)
+            
+            # Steps queued for the next round-trip: (step_num, step_config, params)
+            pending = []
             
             for idx, step_config in enumerate(chain_config):
                 step_num = step_config.get("step", idx + 1)
@@ -63,51 +102,52 @@ class SPChainExecutor:
                 # Check operation filter - skip step if it doesn't apply to current operation
                 operation_filter = step_config.get("operation_filter", "Both")
                 if operation_filter != "Both" and self.operation and operation_filter != self.operation:
-                    self._log(f"\n{'='*80}")
-                    self._log(f"[CHAIN STEP {step_num}] Skipped (operation_filter='{operation_filter}', current_operation='{self.operation}')")
+                    self._log(_SEPARATOR)
+                    self._log("[CHAIN STEP %s] Skipped (operation_filter='%s', current_operation='%s')",
+                              step_num, operation_filter, self.operation)
                     continue
                 
-                self._log(f"\n{'='*80}")
-                self._log(f"[CHAIN STEP {step_num}] Executing {sp_name}...")
+                # A step that consumes outputs of queued steps must wait for them to run
+                input_vars = (step_config.get("input_mapping") or {}).values()
+                if pending and not self._queued_outputs(pending).isdisjoint(input_vars):
+                    failure = self._run_pending(pending)
+                    if failure:
+                        return failure
+                
+                self._log(_SEPARATOR)
+                self._log("[CHAIN STEP %s] Executing %s...", step_num, sp_name)
                 
                 # Build parameters with inheritance
                 params = self._build_parameters_with_inheritance(step_config, step_num)
                 
-                self._log(f"Final parameters: {len(params)} total")
-                self._log(f"  Parameter names: {sorted(params.keys())}")
-                logger.debug(f"  All params: {params}")
-                
-                # Execute SP
-                result = self._execute_sp(sp_name, params)
-                self.execution_results[f"step_{step_num}"] = result
-                
-                # CHECK FOR FAILURES
-                step_status, step_message = self._check_step_status(result, step_num)
-                if not step_status:
-                    self._log(f"[STEP {step_num}] FAILED: {step_message}")
-                    return {
-                        "success": False,
-                        "error": f"Step {step_num} failed",
-                        "sp_message": step_message,
-                        "failed_step": step_num,
-                        "partial_results": self.execution_results,
-                        "chain_data": self.chain_data
-                    }
+                if self._verbose():
+                    self._log("Final parameters: %d total", len(params))
+                    self._log("  Parameter names: %s", sorted(params.keys()))
+                logger.debug("  All params: %s", params)
                 
-                self._log(f"[STEP {step_num}] Status: {step_message}")
-                
-                # Store Step 1 as base for future inheritance
+                # Store Step 1 as base for future inheritance (frozen once so later
+                # steps can share its values through a shallow copy)
                 if step_num == 1:
-                    self.base_parameters = copy.deepcopy(params)
-                    self._log(f"Stored base parameters from Step 1: {len(params)} params")
+                    self.base_parameters = {k: _freeze(v) for k, v in params.items()}
+                    self._log("Stored base parameters from Step 1: %d params", len(params))
+                
+                queued_params = sum(len(item[2]) for item in pending)
+                if pending and queued_params + len(params) > _MAX_BATCH_PARAMS:
+                    failure = self._run_pending(pending)
+                    if failure:
+                        return failure
                 
-                # Extract outputs for next steps
-                if "output_mapping" in step_config:
-                    self._log(f"Extracting outputs with mapping: {step_config['output_mapping']}")
-                    self._extract_outputs(result, step_config["output_mapping"])
-                    self._log(f"Chain data after extraction: {self.chain_data}")
+                pending.append((step_num, step_config, params))
                 
-                self._log(f"[STEP {step_num}] Completed successfully")
+                if not self.batch_independent_steps:
+                    failure = self._run_pending(pending)
+                    if failure:
+                        return failure
+            
+            if pending:
+                failure = self._run_pending(pending)
+                if failure:
+                    return failure
             
             return {
                 "success": True,
@@ -116,8 +156,7 @@ class SPChainExecutor:
             }
         
         except Exception as e:
-            self._log(f"Chain execution failed: {e}")
-            import traceback
+            self._log("Chain execution failed: %s", e)
             self._log(traceback.format_exc())
             return {
                 "success": False,
@@ -126,6 +165,76 @@ class SPChainExecutor:
                 "chain_data": self.chain_data
             }
     
+    @staticmethod
+    def _queued_outputs(pending: List) -> set:
+        """Chain variables that the queued steps will produce."""
+        return {chain_var for _, step_config, _ in pending
+                for chain_var in (step_config.get("output_mapping") or {}).values()}
+    
+    def _run_pending(self, pending: List) -> Dict:
+        """Execute queued steps in one round-trip and post-process them in order.
+        
+        Clears the queue. Returns the failure result of the first failed step,
+        or None if every step succeeded.
+        """
+        try:
+            if len(pending) == 1:
+                step_num, step_config, params = pending[0]
+                results = [self._execute_sp(step_config["sp_name"], params)]
+            else:
+                self._log("[BATCH] Executing steps %s in one round-trip", [item[0] for item in pending])
+                results = self._execute_batch([(step_config["sp_name"], params)
+                                               for _, step_config, params in pending])
+            
+            for (step_num, step_config, params), result in zip(pending, results):
+                self.execution_results[f"step_{step_num}"] = result
+                failure = self._complete_step(step_num, step_config, result)
+                if failure:
+                    return failure
+            return None
+        finally:
+            pending.clear()
+    
+    def _complete_step(self, step_num: int, step_config: Dict, result: Dict) -> Dict:
+        """Check a step's status and extract its outputs.
+        
+        Returns:
+            Failure result dictionary, or None if the step succeeded
+        """
+        # Materialize the first result row once for both the status check and output extraction
+        rows = result.get("rows")
+        try:
+            first_row_list = list(rows[0]) if rows else None
+        except Exception as e:
+            logger.error("[STEP %s] Could not parse result row: %s", step_num, e)
+            step_status, step_message = False, f"Could not parse result row: {e}"
+        else:
+            # CHECK FOR FAILURES
+            step_status, step_message = self._check_step_status(first_row_list, step_num)
+        
+        if not step_status:
+            self._log("[STEP %s] FAILED: %s", step_num, step_message)
+            return {
+                "success": False,
+                "error": f"Step {step_num} failed",
+                "sp_message": step_message,
+                "failed_step": step_num,
+                "partial_results": self.execution_results,
+                "chain_data": self.chain_data
+            }
+        
+        self._log("[STEP %s] Status: %s", step_num, step_message)
+        
+        # Extract outputs for next steps (steps with an empty mapping skip it entirely)
+        output_mapping = step_config.get("output_mapping")
+        if output_mapping:
+            self._log("Extracting outputs with mapping: %s", output_mapping)
+            self._extract_outputs(first_row_list, output_mapping, result.get("description"))
+            self._log("Chain data after extraction: %s", self.chain_data)
+        
+        self._log("[STEP %s] Completed successfully", step_num)
+        return None
+    
     def _build_parameters_with_inheritance(self, step_config: Dict, step_num: int) -> Dict:
         """Build parameters with inheritance.
         
@@ -136,109 +245,106 @@ class SPChainExecutor:
         
         if step_num == 1:
             params = step_config.get("parameters", {}).copy()
-            logger.info(f"Step 1 params: {len(params)} parameters")
+            logger.info("Step 1 params: %d parameters", len(params))
         else:
-            params = copy.deepcopy(self.base_parameters)
+            params = self.base_parameters.copy()
             step_overrides = step_config.get("parameters", {})
             params.update(step_overrides)
             
-            logger.info(f"Step {step_num}:")
-            logger.info(f"  Inherited {len(self.base_parameters)} from Step 1")
-            logger.info(f"  Overridden {len(step_overrides)} with step-specific params")
-            logger.info(f"  Final param count: {len(params)}")
-            logger.debug(f"  Overrides applied: {list(step_overrides.keys())}")
+            logger.info("Step %s:", step_num)
+            logger.info("  Inherited %d from Step 1", len(self.base_parameters))
+            logger.info("  Overridden %d with step-specific params", len(step_overrides))
+            logger.info("  Final param count: %d", len(params))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("  Overrides applied: %s", list(step_overrides.keys()))
         
-        params = self._apply_input_mapping(params, step_config.get("input_mapping", {}))
+        # params is a fresh dict owned by this step, so mappings are applied in place
+        self._apply_input_mapping(params, step_config.get("input_mapping") or {})
         return params
     
     def _apply_input_mapping(self, params: Dict, input_mapping: Dict) -> Dict:
-        """Replace parameter values with chain data from previous steps."""
-        mapped_params = params.copy()
-        
+        """Replace parameter values with chain data from previous steps (modifies params in place)."""
         if not input_mapping:
-            return mapped_params
+            return params
         
-        logger.info(f"Applying input mappings: {input_mapping}")
-        logger.info(f"Available chain_data: {self.chain_data}")
+        logger.info("Applying input mappings: %s", input_mapping)
+        logger.info("Available chain_data: %s", self.chain_data)
         
         for param_name, chain_var in input_mapping.items():
             if chain_var in self.chain_data:
-                old_value = mapped_params.get(param_name)
+                old_value = params.get(param_name)
                 new_value = self.chain_data[chain_var]
-                mapped_params[param_name] = new_value
+                params[param_name] = new_value
                 
-                logger.info(f"  [OK] Mapped {param_name}: {old_value} -> {new_value} (from chain_data['{chain_var}'])")
+                logger.info("  [OK] Mapped %s: %s -> %s (from chain_data['%s'])",
+                            param_name, old_value, new_value, chain_var)
             else:
-                logger.warning(f"  ⚠ Chain variable '{chain_var}' NOT FOUND in chain_data for {param_name}")
-                logger.warning(f"    Available: {list(self.chain_data.keys())}")
+                logger.warning("  ⚠ Chain variable '%s' NOT FOUND in chain_data for %s", chain_var, param_name)
+                logger.warning("    Available: %s", list(self.chain_data.keys()))
         
-        return mapped_params
+        return params
     
-    def _extract_outputs(self, result: Dict, output_mapping: Dict) -> None:
-        """Extract output data and store in chain_data."""
+    def _extract_outputs(self, row_list: List, output_mapping: Dict, description=None) -> None:
+        """Extract output data from the first result row and store in chain_data.
+        
+        Reads the SP's new-ID column (e.g. intnewidschteam) by name when the cursor
+        description is available; otherwise falls back to scanning for the last
+        positive number in the row.
+        """
         if not output_mapping:
             logger.debug("No output mappings specified")
             return
         
-        logger.info(f"Extracting outputs: {output_mapping}")
-        logger.debug(f"Result: {result}")
-        
-        if not result.get("rows") or len(result["rows"]) == 0:
-            logger.warning(f"No rows in result")
+        if not row_list:
+            logger.warning("No rows in result")
             return
         
-        first_row = result["rows"][0]
-        logger.info(f"Extracting from first row: {first_row} (type={type(first_row).__name__})")
+        logger.info("Extracting outputs: %s", output_mapping)
+        logger.info("Extracting from first row: %s", row_list)
         
-        try:
-            if hasattr(first_row, '__getitem__'):
-                row_list = list(first_row)
-            else:
-                logger.warning(f"Cannot convert row to list: {first_row}")
-                return
-        except Exception as e:
-            logger.warning(f"Error converting row: {e}")
+        id_idx = None
+        if description:
+            id_idx = next((i for i, col in enumerate(description) if 'newid' in col[0].lower()), None)
+        if id_idx is not None and id_idx < len(row_list) and row_list[id_idx] is not None:
+            self._store_output(output_mapping, row_list[id_idx])
             return
         
-        logger.debug(f"Row as list: {row_list}")
-        
-        # Scan backwards to find the numeric ID (usually last number in row)
-        for col_idx in range(len(row_list) - 1, -1, -1):
-            cell_value = row_list[col_idx]
-            cell_type = type(cell_value).__name__
-            logger.debug(f"  Column {col_idx}: {cell_value} (type={cell_type})")
-            
-            if isinstance(cell_value, (int, float)) and not isinstance(cell_value, bool) and cell_value > 0:
-                for param_name, chain_var in output_mapping.items():
-                    old_val = self.chain_data.get(chain_var)
-                    self.chain_data[chain_var] = cell_value
-                    logger.info(f"  [OK] Stored chain_data['{chain_var}'] = {cell_value} (was {old_val})")
-                    return
+        # Scan backwards to find the numeric ID (usually last number in row);
+        # exact type checks skip bool without a second isinstance call
+        for cell_value in reversed(row_list):
+            cell_type = type(cell_value)
+            if (cell_type is int or cell_type is float) and cell_value > 0:
+                self._store_output(output_mapping, cell_value)
+                return
         
-        logger.warning(f"Could not extract numeric ID from row: {first_row}")
+        logger.warning("Could not extract numeric ID from row: %s", row_list)
+    
+    def _store_output(self, output_mapping: Dict, value: Any) -> None:
+        """Store an extracted ID under the first mapped chain variable."""
+        for param_name, chain_var in output_mapping.items():
+            old_val = self.chain_data.get(chain_var)
+            self.chain_data[chain_var] = value
+            logger.info("  [OK] Stored chain_data['%s'] = %s (was %s)", chain_var, value, old_val)
+            return
     
-    def _check_step_status(self, result: Dict, step_num: int) -> tuple:
+    def _check_step_status(self, row_list: List, step_num: int) -> tuple:
         """Check if a step succeeded or failed based on SP output.
         
         SP returns rows with format: (intStatus, strstatusschteam, intnewidschteam)
         - intStatus: 1=success, 0=failure
         - strstatusschteam: Message
         - intnewidschteam: ID or other data
+        
+        Args:
+            row_list: First result row as a list (None if no rows were returned)
+            step_num: Step number for logging
         """
-        if not result.get("rows") or len(result["rows"]) == 0:
-            logger.warning(f"[STEP {step_num}] No result rows returned")
+        if row_list is None:
+            logger.warning("[STEP %s] No result rows returned", step_num)
             return (False, "No result rows returned from SP")
         
-        first_row = result["rows"][0]
-        
-        try:
-            row_list = list(first_row)
-        except Exception as e:
-            logger.error(f"[STEP {step_num}] Could not parse result row: {e}")
-            return (False, f"Could not parse result row: {e}")
-        
         if len(row_list) < 2:
-            logger.error(f"[STEP {step_num}] Result row has insufficient columns: {row_list}")
+            logger.error("[STEP %s] Result row has insufficient columns: %s", step_num, row_list)
             return (False, "Result row has insufficient columns")
         
         int_status = row_list[0]
@@ -246,18 +352,27 @@ class SPChainExecutor:
         
         is_success = bool(int_status) and int(int_status) != 0
         
-        logger.debug(f"[STEP {step_num}] Status check: intStatus={int_status}, isSuccess={is_success}")
-        logger.debug(f"[STEP {step_num}] Message: {str_message}")
+        logger.debug("[STEP %s] Status check: intStatus=%s, isSuccess=%s", step_num, int_status, is_success)
+        logger.debug("[STEP %s] Message: %s", step_num, str_message)
         
         return (is_success, str_message)
     
     def _execute_sp(self, sp_name: str, params: Dict) -> Dict:
         """Execute single SP and capture outputs."""
-        from database_layer.procedure_executor import run_stored_procedure
-        
+        if self.session is not None:
+            return run_stored_procedure_with_session(
+                self.session,
+                sp_name,
+                params,
+                capture_output_params=True
+            )
         result = run_stored_procedure(
             sp_name,
             params,
             capture_output_params=True
         )
         return result
+    
+    def _execute_batch(self, calls: List) -> List[Dict]:
+        """Execute several independent SPs in one round-trip."""
+        return run_stored_procedure_batch(calls, db=self.session)
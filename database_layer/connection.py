@@ -3,8 +3,10 @@
 import pyodbc
 import logging
 import re
+from contextlib import suppress
 from config.config import DatabaseConfig
 from database_layer.transaction_manager import get_test_transaction
+from database_layer import pool
 
 logger = logging.getLogger('sp_validation')
 
@@ -81,24 +83,16 @@ class DBSession:
     """Context manager for database sessions."""
     
     def __enter__(self):
-        DatabaseConfig.validate()
-        
         # Check if we're in a test transaction context
         test_transaction = get_test_transaction()
         if test_transaction:
             self.conn = test_transaction
             self.cursor = self.conn.cursor()
+            self.cursor.fast_executemany = True
             self._is_test_txn = True
         else:
-            # Create a new connection
-            self.conn = pyodbc.connect(
-                f"DRIVER={{SQL Server}};"
-                f"SERVER={DatabaseConfig.DB_HOST};"
-                f"DATABASE={DatabaseConfig.DB_NAME};"
-                f"UID={DatabaseConfig.DB_USER};"
-                f"PWD={DatabaseConfig.DB_PASSWORD}"
-            )
-            self.cursor = self.conn.cursor()
+            # Borrow a live connection (and its long-lived cursor) from the pool
+            self.conn, self.cursor = pool.acquire()
             self._is_test_txn = False
         
         return self
@@ -106,15 +100,38 @@ class DBSession:
     def __exit__(self, exc_type, exc_val, exc_tb):
         # Only manage transaction if this session created the connection
         if not self._is_test_txn:
-            if exc_type is None:
-                # No exception - commit the transaction
-                self.conn.commit()
-            else:
-                # Exception occurred - rollback
-                self.conn.rollback()
-            self.cursor.close()
-            self.conn.close()
+            try:
+                if exc_type is None:
+                    # Read past unread result sets first: the statements behind them
+                    # must have run (and raised any error) before the commit, and
+                    # without MARS pending results leave the pooled connection busy
+                    while self.cursor.nextset():
+                        pass
+                    # No exception - commit the transaction
+                    self.conn.commit()
+                else:
+                    # Everything is rolled back, so errors from unread results don't matter
+                    with suppress(pyodbc.Error):
+                        while self.cursor.nextset():
+                            pass
+                    # Exception occurred - rollback
+                    self.conn.rollback()
+            except pyodbc.Error:
+                # Connection is in an unknown state - don't hand it back to the pool
+                pool.discard(self.conn, self.cursor)
+                raise
+            # Cursor stays open so the next session reuses its prepared statement
+            pool.release(self.conn, self.cursor)
         # If this is a test transaction, don't close or commit - let the fixture handle it
+    
+    def rollback(self):
+        """Discard the work done on this session so far.
+        
+        Inside a test transaction this is a no-op: the fixture owns that
+        transaction and rolls it back when the test ends.
+        """
+        if not self._is_test_txn:
+            self.conn.rollback()
 
     def execute_query(self, query, params=None):
         """Execute a query and return all results.
@@ -127,29 +144,107 @@ class DBSession:
             self.cursor.execute(query, params)
             return self.cursor.fetchall()
         except pyodbc.DatabaseError as e:
-            # Extract parameter information from query
-            params_dict = self._extract_params_from_query(query, params)
-            parsed_msg, param_name, param_value, error_type = parse_sql_error(str(e), params_dict)
-            
-            # Log detailed error information
-            logger.error(f"Database Error: {parsed_msg}")
-            logger.debug(f"Error Type: {error_type}")
-            if param_name:
-                logger.error(f"  Problematic Parameter: '{param_name}'")
-                logger.error(f"  Value: {param_value}")
-            logger.debug(f"  Query: {query}")
-            logger.debug(f"  Parameters: {params_dict}")
-            
-            # Raise detailed error
-            raise ParameterValidationError(
-                parsed_msg, 
-                parameter_name=param_name,
-                value=param_value,
-                error_type=error_type
-            ) from e
+            raise self._validation_error(e, query, params) from e
+        except Exception as e:
+            logger.error(f"Unexpected error during query execution: {e}")
+            raise
+    
+    def execute_iter(self, query, params=None):
+        """Execute a query and yield its rows one at a time instead of fetching them all.
+        
+        The rows must be consumed before the session exits or runs another query.
+        
+        Raises:
+            ParameterValidationError: If SQL validation fails with parameter details
+        """
+        params = params or []
+        try:
+            self.cursor.execute(query, params)
+        except pyodbc.DatabaseError as e:
+            raise self._validation_error(e, query, params) from e
         except Exception as e:
             logger.error(f"Unexpected error during query execution: {e}")
             raise
+        yield from self.cursor
+    
+    def execute_one(self, query, params=None):
+        """Execute a query and return only its first row (None if no rows).
+        
+        Raises:
+            ParameterValidationError: If SQL validation fails with parameter details
+        """
+        params = params or []
+        try:
+            return self.cursor.execute(query, params).fetchone()
+        except pyodbc.DatabaseError as e:
+            raise self._validation_error(e, query, params) from e
+        except Exception as e:
+            logger.error(f"Unexpected error during query execution: {e}")
+            raise
+    
+    def executemany(self, query, seq_of_params):
+        """Execute one statement for every parameter set in a single array-bound round-trip.
+        
+        The session cursor has fast_executemany enabled, so each parameter must have
+        the same type in every row (ODBC binds one column array per parameter);
+        mixing e.g. int and str or None-only columns can fail or truncate.
+        
+        Raises:
+            ParameterValidationError: If SQL validation fails with parameter details
+        """
+        try:
+            self.cursor.executemany(query, seq_of_params)
+        except pyodbc.DatabaseError as e:
+            raise self._validation_error(e, query, []) from e
+        except Exception as e:
+            logger.error(f"Unexpected error during executemany: {e}")
+            raise
+    
+    def execute_batch(self, query, params=None):
+        """Execute a multi-statement batch and return the rows of every result set.
+        
+        Statements that produce no result set (row counts, SET options) are skipped.
+        
+        Raises:
+            ParameterValidationError: If SQL validation fails with parameter details
+        """
+        params = params or []
+        try:
+            self.cursor.execute(query, params)
+            rowsets = []
+            while True:
+                if self.cursor.description is not None:
+                    rowsets.append(self.cursor.fetchall())
+                if not self.cursor.nextset():
+                    break
+            return rowsets
+        except pyodbc.DatabaseError as e:
+            raise self._validation_error(e, query, params) from e
+        except Exception as e:
+            logger.error(f"Unexpected error during batch execution: {e}")
+            raise
+    
+    def _validation_error(self, error, query, params):
+        """Log a database error and build a ParameterValidationError for it."""
+        # Extract parameter information from query
+        params_dict = self._extract_params_from_query(query, params)
+        parsed_msg, param_name, param_value, error_type = parse_sql_error(str(error), params_dict)
+        
+        # Log detailed error information
+        logger.error(f"Database Error: {parsed_msg}")
+        logger.debug(f"Error Type: {error_type}")
+        if param_name:
+            logger.error(f"  Problematic Parameter: '{param_name}'")
+            logger.error(f"  Value: {param_value}")
+        logger.debug(f"  Query: {query}")
+        logger.debug(f"  Parameters: {params_dict}")
+        
+        return ParameterValidationError(
+            parsed_msg, 
+            parameter_name=param_name,
+            value=param_value,
+            error_type=error_type
+        )
     
     def _extract_params_from_query(self, query, params):
         """Extract parameter names and values from EXEC query.
@@ -188,13 +283,10 @@ class DBSession:
 
 
 def get_connection():
-    """Get a raw pyodbc connection (not a context manager)."""
+    """Get a raw pyodbc connection (not a context manager).
+
+    The caller owns the connection and must close it; it is not taken from the pool.
+    """
     DatabaseConfig.validate()
-    conn = pyodbc.connect(
-        f"DRIVER={{SQL Server}};"
-        f"SERVER={DatabaseConfig.DB_HOST};"
-        f"DATABASE={DatabaseConfig.DB_NAME};"
-        f"UID={DatabaseConfig.DB_USER};"
-        f"PWD={DatabaseConfig.DB_PASSWORD}"
-    )
+    conn = pyodbc.connect(DatabaseConfig.DSN)
     return conn
@@ -1,185 +1,302 @@
 """SQL Type Normalizer - Converts Python values to SQL-compatible formats."""
 
 from datetime import datetime, date, time
+from functools import lru_cache
 import logging
-from typing import Any, Dict, Optional
-import re
+import sys
+from typing import Any, Callable, Dict, Optional
 
 logger = logging.getLogger('sp_validation')
 
 
+@lru_cache(maxsize=4096)
 def _looks_like_date(value: str) -> bool:
-    """Check if a string value looks like a date."""
-    if not isinstance(value, str):
-        return False
+    """Check if a string value looks like a date (callers must pass a str).
     
+    Recognized prefixes (anything may follow them):
+    - ISO format: YYYY-MM-DD (also covers YYYY-MM-DD HH:MM:SS)
+    - Various other date formats with slashes: M/D/YY through MM/DD/YYYY
+    - Month name formats: Jan 1 1900, Dec 30 1995 (also covers Jan 1 1900 12:00AM)
+    
+    Implemented with plain character checks rather than regex matching, since only
+    the first few characters are ever inspected. Results are cached because the
+    same values recur across test cases and chain steps.
+    """
     value = value.strip()
+    n = len(value)
     
     # ISO format: YYYY-MM-DD
-    if re.match(r'^\d{4}-\d{2}-\d{2}', value):
-        return True
-    
-    # SQL datetime format: YYYY-MM-DD HH:MM:SS
-    if re.match(r'^\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}', value):
+    if (n >= 10 and value[4] == '-' and value[7] == '-'
+            and value[:4].isdecimal() and value[5:7].isdecimal() and value[8:10].isdecimal()):
         return True
     
-    # Various other date formats with slashes
-    if re.match(r'^\d{1,2}/\d{1,2}/\d{2,4}', value):
-        return True
+    # Slashed formats: 1-2 digits / 1-2 digits / at least 2 digits
+    if '/' in value[1:3]:
+        parts = value.split('/', 2)
+        if (len(parts) == 3
+                and 1 <= len(parts[0]) <= 2 and parts[0].isdecimal()
+                and 1 <= len(parts[1]) <= 2 and parts[1].isdecimal()
+                and len(parts[2]) >= 2 and parts[2][:2].isdecimal()):
+            return True
     
-    # Month name formats: Jan 1 1900, Dec 30 1995
-    if re.match(r'^[A-Za-z]{3}\s+\d{1,2}\s+\d{4}', value):
-        return True
-    
-    # Month name with time: Jan 1 1900 12:00AM
-    if re.match(r'^[A-Za-z]{3}\s+\d{1,2}\s+\d{4}\s+\d{1,2}:\d{2}', value):
-        return True
+    # Month name formats: 3 letters, whitespace, 1-2 digit day, whitespace, 4 digit year
+    month = value[:3]
+    if n >= 10 and month.isascii() and month.isalpha():
+        i = 3
+        while i < n and value[i].isspace():
+            i += 1
+        day_start = i
+        while i < n and value[i].isdecimal():
+            i += 1
+        if day_start > 3 and 1 <= i - day_start <= 2:
+            year_start = i
+            while i < n and value[i].isspace():
+                i += 1
+            if i > year_start and len(value[i:i + 4]) == 4 and value[i:i + 4].isdecimal():
+                return True
     
     return False
 
 
+# The same date values recur across parameter sets and chain steps; date and
+# datetime objects are immutable and hashable, so their formatted text is cached.
+# Aware datetimes skip the cache: the same instant in two zones compares (and
+# hashes) equal, but the two format to different local times.
+@lru_cache(maxsize=1024)
+def _fmt_date_cached(value: date) -> str:
+    """Format a date or datetime as YYYY-MM-DD."""
+    if isinstance(value, datetime):
+        value = value.date()
+    return value.isoformat()
+
+
+@lru_cache(maxsize=1024)
+def _fmt_datetime_cached(value: date) -> str:
+    """Format a datetime (or a date, at midnight) as YYYY-MM-DD HH:MM:SS."""
+    if isinstance(value, datetime):
+        # isoformat would append a UTC offset for aware values; the SQL text never had one
+        return value.replace(tzinfo=None).isoformat(sep=' ', timespec='seconds')
+    return f"{value.isoformat()} 00:00:00"
+
+
+def _fmt_date(value: date) -> str:
+    """Format a date or datetime as YYYY-MM-DD (local date for aware datetimes)."""
+    if getattr(value, 'tzinfo', None) is not None:
+        return _fmt_date_cached.__wrapped__(value)
+    return _fmt_date_cached(value)
+
+
+def _fmt_datetime(value: date) -> str:
+    """Format a datetime (or a date, at midnight) as YYYY-MM-DD HH:MM:SS (local time for aware datetimes)."""
+    if getattr(value, 'tzinfo', None) is not None:
+        return _fmt_datetime_cached.__wrapped__(value)
+    return _fmt_datetime_cached(value)
+
+
 class SQLDataType:
-    """SQL Server data types enumeration."""
-    INT = "INT"
-    BIGINT = "BIGINT"
-    SMALLINT = "SMALLINT"
-    TINYINT = "TINYINT"
-    FLOAT = "FLOAT"
-    DECIMAL = "DECIMAL"
-    NUMERIC = "NUMERIC"
-    BIT = "BIT"
-    CHAR = "CHAR"
-    VARCHAR = "VARCHAR"
-    NCHAR = "NCHAR"
-    NVARCHAR = "NVARCHAR"
-    TEXT = "TEXT"
-    NTEXT = "NTEXT"
-    DATE = "DATE"
-    TIME = "TIME"
-    DATETIME = "DATETIME"
-    DATETIME2 = "DATETIME2"
-    DATETIMEOFFSET = "DATETIMEOFFSET"
-    SMALLDATETIME = "SMALLDATETIME"
-    MONEY = "MONEY"
-    SMALLMONEY = "SMALLMONEY"
-    BINARY = "BINARY"
-    VARBINARY = "VARBINARY"
+    """SQL Server data types enumeration (interned, so type comparisons are identity checks)."""
+    INT = sys.intern("INT")
+    BIGINT = sys.intern("BIGINT")
+    SMALLINT = sys.intern("SMALLINT")
+    TINYINT = sys.intern("TINYINT")
+    FLOAT = sys.intern("FLOAT")
+    DECIMAL = sys.intern("DECIMAL")
+    NUMERIC = sys.intern("NUMERIC")
+    BIT = sys.intern("BIT")
+    CHAR = sys.intern("CHAR")
+    VARCHAR = sys.intern("VARCHAR")
+    NCHAR = sys.intern("NCHAR")
+    NVARCHAR = sys.intern("NVARCHAR")
+    TEXT = sys.intern("TEXT")
+    NTEXT = sys.intern("NTEXT")
+    DATE = sys.intern("DATE")
+    TIME = sys.intern("TIME")
+    DATETIME = sys.intern("DATETIME")
+    DATETIME2 = sys.intern("DATETIME2")
+    DATETIMEOFFSET = sys.intern("DATETIMEOFFSET")
+    SMALLDATETIME = sys.intern("SMALLDATETIME")
+    MONEY = sys.intern("MONEY")
+    SMALLMONEY = sys.intern("SMALLMONEY")
+    BINARY = sys.intern("BINARY")
+    VARBINARY = sys.intern("VARBINARY")
 
 
-class SQLNormalizer:
-    """Normalize Python values to SQL-compatible formats based on explicit SQL type metadata."""
+# SQL type families that share a normalizer
+_INT_TYPES = frozenset({SQLDataType.INT, SQLDataType.BIGINT, SQLDataType.SMALLINT, SQLDataType.TINYINT})
+_DATETIME_TYPES = frozenset({SQLDataType.DATETIME, SQLDataType.DATETIME2,
+                             SQLDataType.SMALLDATETIME, SQLDataType.DATETIMEOFFSET})
+_DECIMAL_TYPES = frozenset({SQLDataType.DECIMAL, SQLDataType.NUMERIC, SQLDataType.MONEY, SQLDataType.SMALLMONEY})
 
-    @staticmethod
-    def normalize(param_name: str, value: Any, sql_type: Optional[str] = None) -> Any:
-        """Normalize a parameter value for SQL execution."""
-        if value is None:
-            return None
+
+def normalize(param_name: str, value: Any, sql_type: Optional[str] = None) -> Any:
+    """Normalize a parameter value for SQL execution."""
+    if value is None:
+        return None
+    
+    if sql_type is None:
+        logger.debug("No explicit SQL type for '%s' - value returned unchanged", param_name)
+        return value
+    
+    target_type = sql_type
+    try:
+        handler = _TYPE_HANDLERS.get(target_type)
+        if handler is None:
+            return value
+        return handler(param_name, value)
+    
+    except Exception as e:
+        logger.warning(
+            "Failed to normalize parameter '%s' with value '%s' to type '%s': %s",
+            param_name, value, target_type, e
+        )
+        return value
+
+
+def handler_for(sql_type: Optional[str]) -> Optional[Callable[[str, Any], Any]]:
+    """Return the normalizer for a SQL type as handler(param_name, value).
+    
+    Handlers expect a non-None value and may raise; normalize() handles both.
+    
+    Returns:
+        Handler function, or None if values of this type pass through unchanged
+    """
+    return _TYPE_HANDLERS.get(sql_type)
+
+
+def _normalize_int(param_name: str, value: Any, target_type: str) -> Any:
+    """Convert integer-typed values (numeric strings, bools, floats) to int."""
+    if isinstance(value, str):
+        value_stripped = value.strip()
         
-        if sql_type is None:
-            logger.debug(f"No explicit SQL type for '{param_name}' - value returned unchanged")
+        # Plain numbers ('42', '-17', '3.5') can never look like a date
+        is_numeric = value_stripped.lstrip('+-').replace('.', '', 1).isdecimal()
+        if not is_numeric and _looks_like_date(value_stripped):
+            logger.debug(
+                "Parameter '%s' has date string '%s' but SQL type is %s - returning as-is",
+                param_name, value, target_type
+            )
             return value
         
-        target_type = sql_type
+        if value_stripped == '':
+            return 0
+        
+        # Exact int() parse first (no float round-trip, so BIGINTs beyond 2**53
+        # keep their value); only decimal/exponent forms need int(float())
         try:
-            # Date types - format for SQL
-            if target_type == SQLDataType.DATE:
-                return SQLNormalizer._normalize_date(value)
-            
-            elif target_type in (SQLDataType.DATETIME, SQLDataType.DATETIME2,
-                                 SQLDataType.SMALLDATETIME, SQLDataType.DATETIMEOFFSET):
-                return SQLNormalizer._normalize_datetime(value)
-            
-            elif target_type == SQLDataType.TIME:
-                return SQLNormalizer._normalize_time(value)
-            
-            # Integer types
-            elif target_type in (SQLDataType.INT, SQLDataType.BIGINT,
-                                SQLDataType.SMALLINT, SQLDataType.TINYINT):
-                if isinstance(value, str):
-                    value_stripped = value.strip()
-                    
-                    if _looks_like_date(value_stripped):
-                        logger.debug(
-                            f"Parameter '{param_name}' has date string '{value}' "
-                            f"but SQL type is {target_type} - returning as-is"
-                        )
-                        return value
-                    
-                    if value_stripped == '':
-                        return 0
-                    
-                    try:
-                        return int(float(value_stripped))
-                    except ValueError:
-                        logger.warning(f"Cannot convert string '{value}' to int, passing as-is")
-                        return value
-                elif isinstance(value, bool):
-                    return 1 if value else 0
-                elif isinstance(value, float):
-                    return int(value)
-                return value
-            
-            # Bit type
-            elif target_type == SQLDataType.BIT:
-                if isinstance(value, str):
-                    if value.strip() == '':
-                        return 0
-                    try:
-                        return 1 if int(value) != 0 else 0
-                    except ValueError:
-                        return value
-                elif isinstance(value, bool):
-                    return 1 if value else 0
-                elif isinstance(value, int):
-                    return 1 if value != 0 else 0
-                return value
-            
-            # Decimal type
-            elif target_type in (SQLDataType.DECIMAL, SQLDataType.NUMERIC,
-                                SQLDataType.MONEY, SQLDataType.SMALLMONEY):
-                if isinstance(value, str) and value.strip() == '':
-                    return 0
-                return value
-            
+            return int(value_stripped)
+        except ValueError:
+            pass
+        try:
+            return int(float(value_stripped))
+        except ValueError:
+            logger.warning("Cannot convert string '%s' to int, passing as-is", value)
             return value
-        
-        except Exception as e:
-            logger.warning(
-                f"Failed to normalize parameter '{param_name}' with value '{value}' "
-                f"to type '{target_type}': {str(e)}"
-            )
+    elif isinstance(value, bool):
+        return 1 if value else 0
+    elif isinstance(value, float):
+        return int(value)
+    return value
+
+
+def _normalize_bit(value: Any) -> Any:
+    """Convert bit-typed values to 0/1."""
+    if isinstance(value, str):
+        if value.strip() == '':
+            return 0
+        try:
+            return 1 if int(value) != 0 else 0
+        except ValueError:
             return value
+    elif isinstance(value, bool):
+        return 1 if value else 0
+    elif isinstance(value, int):
+        return 1 if value != 0 else 0
+    return value
 
-    @staticmethod
-    def _normalize_date(value: Any) -> Any:
-        """Format date values to SQL date format (YYYY-MM-DD)."""
-        if isinstance(value, date) and not isinstance(value, datetime):
-            return value.strftime('%Y-%m-%d')
-        if isinstance(value, datetime):
-            return value.strftime('%Y-%m-%d')
-        if isinstance(value, int) and value == 0:
-            return None
-        return value
 
-    @staticmethod
-    def _normalize_time(value: Any) -> Any:
-        """Format time values to SQL time format (HH:MM:SS)."""
-        if isinstance(value, time):
-            return value.strftime('%H:%M:%S')
-        if isinstance(value, datetime):
-            return value.strftime('%H:%M:%S')
-        return value
+def _normalize_decimal(value: Any) -> Any:
+    """Convert empty decimal-typed strings to 0."""
+    if isinstance(value, str) and value.strip() == '':
+        return 0
+    return value
 
-    @staticmethod
-    def _normalize_datetime(value: Any) -> Any:
-        """Format datetime values to SQL datetime format (YYYY-MM-DD HH:MM:SS)."""
-        if isinstance(value, datetime):
-            return value.strftime('%Y-%m-%d %H:%M:%S')
-        if isinstance(value, date):
-            return f"{value.strftime('%Y-%m-%d')} 00:00:00"
-        if isinstance(value, int) and value == 0:
-            return None
-        return value
+
+def _normalize_date(value: Any) -> Any:
+    """Format date values to SQL date format (YYYY-MM-DD)."""
+    # Exact type checks first; isinstance only for subclasses (e.g. pandas Timestamp).
+    # 'type is int' keeps False (a bool) from being treated as the 0 = NULL marker.
+    t = type(value)
+    if t is date or t is datetime:
+        return _fmt_date(value)
+    if t is int:
+        return None if value == 0 else value
+    if t is not str and isinstance(value, date):
+        return _fmt_date(value)
+    return value
+
+
+def _normalize_time(value: Any) -> Any:
+    """Format time values to SQL time format (HH:MM:SS)."""
+    t = type(value)
+    if t is not time and t is not datetime and t is not str:
+        # Rare subclasses (e.g. pandas Timestamp) map onto their base type
+        t = time if isinstance(value, time) else datetime if isinstance(value, datetime) else t
+    if t is time:
+        return value.replace(tzinfo=None).isoformat(timespec='seconds')
+    if t is datetime:
+        return value.time().isoformat(timespec='seconds')
+    return value
+
+
+def _normalize_datetime(value: Any) -> Any:
+    """Format datetime values to SQL datetime format (YYYY-MM-DD HH:MM:SS)."""
+    t = type(value)
+    if t is datetime or t is date:
+        return _fmt_datetime(value)
+    if t is int:
+        return None if value == 0 else value
+    if t is not str and isinstance(value, date):
+        return _fmt_datetime(value)
+    return value
+
+
+# SQL type -> handler(param_name, value); types not listed pass through unchanged
+_TYPE_HANDLERS = {
+    # Date types - format for SQL
+    SQLDataType.DATE: lambda param_name, value: _normalize_date(value),
+    SQLDataType.TIME: lambda param_name, value: _normalize_time(value),
+    # Bit type
+    SQLDataType.BIT: lambda param_name, value: _normalize_bit(value),
+}
+_TYPE_HANDLERS.update({
+    sql_type: lambda param_name, value: _normalize_datetime(value)
+    for sql_type in _DATETIME_TYPES
+})
+# Integer types (the type is bound per entry for log messages)
+_TYPE_HANDLERS.update({
+    sql_type: lambda param_name, value, sql_type=sql_type: _normalize_int(param_name, value, sql_type)
+    for sql_type in _INT_TYPES
+})
+# Decimal types
+_TYPE_HANDLERS.update({
+    sql_type: lambda param_name, value: _normalize_decimal(value)
+    for sql_type in _DECIMAL_TYPES
+})
+
+
+class SQLNormalizer:
+    """Normalize Python values to SQL-compatible formats based on explicit SQL type metadata.
+    
+    Kept for backward compatibility; the module-level functions are the implementation.
+    """
+    normalize = staticmethod(normalize)
+    handler_for = staticmethod(handler_for)
+    _normalize_int = staticmethod(_normalize_int)
+    _normalize_bit = staticmethod(_normalize_bit)
+    _normalize_decimal = staticmethod(_normalize_decimal)
+    _normalize_date = staticmethod(_normalize_date)
+    _normalize_time = staticmethod(_normalize_time)
+    _normalize_datetime = staticmethod(_normalize_datetime)
 
 
 class ParameterNormalizer:
@@ -192,23 +309,97 @@ class ParameterNormalizer:
         if not parameters:
             return {}
         
-        normalized = {}
-        type_mappings = type_mappings or {}
+        # Untyped parameters pass through unchanged, so only typed ones are visited
+        if not type_mappings:
+            return dict(parameters)
         
-        for param_name, value in parameters.items():
-            try:
-                sql_type = type_mappings.get(param_name)
-                normalized_value = SQLNormalizer.normalize(param_name, value, sql_type)
-                normalized[param_name] = normalized_value
-                
+        # Each distinct type mapping is compiled once into per-parameter normalizers,
+        # so repeated calls for the same SP skip the type dispatch entirely
+        plan = ParameterNormalizer.compile_plan(type_mappings)
+        
+        normalized = dict(parameters)
+        for param_name, normalize_value in plan:
+            if param_name in parameters:
+                normalized[param_name] = normalize_value(parameters[param_name])
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            for param_name in type_mappings.keys() & parameters.keys():
+                value = parameters[param_name]
+                normalized_value = normalized[param_name]
                 if normalized_value != value:
                     logger.debug(
-                        f"Normalized '{param_name}': {type(value).__name__}({repr(value)}) "
-                        f"-> {type(normalized_value).__name__}({repr(normalized_value)})"
+                        "Normalized '%s': %s(%r) -> %s(%r)",
+                        param_name, type(value).__name__, value,
+                        type(normalized_value).__name__, normalized_value
                     )
-            
-            except Exception as e:
-                logger.error(f"Error normalizing parameter '{param_name}': {str(e)}")
-                normalized[param_name] = value
         
         return normalized
+
+    @staticmethod
+    def compile_normalizer(param_name: str, sql_type: Optional[str]) -> Optional[Callable[[Any], Any]]:
+        """Build a single-argument normalizer for one parameter with a known SQL type.
+        
+        The type dispatch happens once here instead of on every call, so the result
+        can be cached per stored procedure and applied to many parameter sets.
+        
+        Args:
+            param_name: Parameter name (used in log messages)
+            sql_type: SQL type of the parameter
+        
+        Returns:
+            Function value -> normalized value, or None if the type needs no normalization
+        """
+        handler = handler_for(sql_type)
+        if handler is None:
+            return None
+        
+        def normalize_value(value: Any) -> Any:
+            if value is None:
+                return None
+            try:
+                return handler(param_name, value)
+            except Exception as e:
+                logger.warning(
+                    "Failed to normalize parameter '%s' with value '%s' to type '%s': %s",
+                    param_name, value, sql_type, e
+                )
+                return value
+        
+        if sql_type not in _INT_TYPES:
+            return normalize_value
+        
+        def normalize_int_value(value: Any) -> Any:
+            # Plain (optionally negative) digit strings, the bulk of test data,
+            # convert inline; they can never look like a date
+            if type(value) is str:
+                stripped = value.strip()
+                digits = stripped[1:] if stripped[:1] == '-' else stripped
+                if digits.isdecimal():
+                    return int(stripped)
+            return normalize_value(value)
+        
+        return normalize_int_value
+
+    @staticmethod
+    def compile_plan(type_mappings: Dict[str, str]) -> tuple:
+        """Compile type mappings into a normalization plan.
+        
+        Args:
+            type_mappings: Dict of param_name -> SQL type
+        
+        Returns:
+            Tuple of (param_name, normalizer) pairs for every parameter whose type
+            needs normalization (cached per distinct mapping)
+        """
+        return _compile_plan(frozenset(type_mappings.items()))
+
+
+@lru_cache(maxsize=128)
+def _compile_plan(type_items: frozenset) -> tuple:
+    """Build the (param_name, normalizer) plan for one set of (param_name, sql_type) items."""
+    plan = []
+    for param_name, sql_type in type_items:
+        normalize_value = ParameterNormalizer.compile_normalizer(param_name, sql_type)
+        if normalize_value is not None:
+            plan.append((param_name, normalize_value))
+    return tuple(plan)
@@ -0,0 +1,111 @@
+"""Connection Pool - Reuses live pyodbc connections across DBSession instances."""
+
+import queue
+import threading
+import atexit
+import logging
+import pyodbc
+from config.config import DatabaseConfig
+
+logger = logging.getLogger('sp_validation')
+
+# Let the ODBC driver manager pool connections too (must be set before the first connect)
+pyodbc.pooling = True
+
+# One bounded LIFO queue per connection string; LIFO keeps the warmest connection on top
+_POOLS = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def _get_pool(dsn):
+    """Get (or lazily create) the pool for a connection string."""
+    pool = _POOLS.get(dsn)
+    if pool is None:
+        with _POOLS_LOCK:
+            pool = _POOLS.setdefault(dsn, queue.LifoQueue(maxsize=DatabaseConfig.DB_POOL_SIZE))
+    return pool
+
+
+def _is_alive(conn):
+    """Check that a pooled connection is still usable.
+
+    Uses a throwaway cursor so the pooled cursor keeps its prepared statement.
+    """
+    try:
+        probe = conn.cursor()
+        probe.execute("SELECT 1").fetchone()
+        probe.close()
+        return True
+    except pyodbc.Error:
+        return False
+
+
+def acquire(dsn=None):
+    """Get a live connection and its cursor from the pool, opening a new one if none is available.
+
+    Each pooled connection keeps one long-lived cursor so that pyodbc's
+    prepared-statement handle survives across sessions.
+
+    Args:
+        dsn: Optional connection string (defaults to DatabaseConfig.DSN)
+
+    Returns:
+        Tuple of (pyodbc connection, pyodbc cursor)
+    """
+    dsn = dsn or DatabaseConfig.DSN
+    pool = _get_pool(dsn)
+
+    while True:
+        try:
+            conn, cursor = pool.get_nowait()
+        except queue.Empty:
+            break
+        if _is_alive(conn):
+            return conn, cursor
+        logger.debug("Discarding dead pooled connection")
+        discard(conn, cursor)
+
+    DatabaseConfig.validate()
+    conn = pyodbc.connect(dsn)
+    cursor = conn.cursor()
+    # Bind executemany() parameters as arrays (one round-trip) instead of one EXEC per row
+    cursor.fast_executemany = True
+    return conn, cursor
+
+
+def release(conn, cursor, dsn=None):
+    """Return a connection and its cursor to the pool (closes them if the pool is full).
+
+    The caller is responsible for committing or rolling back first.
+    """
+    dsn = dsn or DatabaseConfig.DSN
+    try:
+        _get_pool(dsn).put_nowait((conn, cursor))
+    except queue.Full:
+        discard(conn, cursor)
+
+
+def close_all():
+    """Close every pooled connection."""
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+    for pool in pools:
+        while True:
+            try:
+                conn, cursor = pool.get_nowait()
+            except queue.Empty:
+                break
+            discard(conn, cursor)
+
+
+def discard(conn, cursor=None):
+    """Close a connection (and cursor), ignoring errors from already-broken connections."""
+    try:
+        if cursor is not None:
+            cursor.close()
+        conn.close()
+    except pyodbc.Error:
+        pass
+
+
+atexit.register(close_all)
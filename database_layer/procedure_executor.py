@@ -2,71 +2,134 @@
 
 from database_layer.connection import DBSession
 from database_layer.normalizer import ParameterNormalizer, SQLDataType
+from contextlib import nullcontext, suppress
+from functools import lru_cache
+from types import MappingProxyType
 import logging
+import re
+import sys
 
 logger = logging.getLogger('sp_validation')
 
+# SQL Server type name (as reported by INFORMATION_SCHEMA) -> SQLDataType
+_SQL_TYPE_MAP = {
+    'INT': SQLDataType.INT,
+    'BIGINT': SQLDataType.INT,
+    'SMALLINT': SQLDataType.INT,
+    'TINYINT': SQLDataType.INT,
+    'FLOAT': SQLDataType.FLOAT,
+    'REAL': SQLDataType.FLOAT,
+    'DECIMAL': SQLDataType.DECIMAL,
+    'NUMERIC': SQLDataType.DECIMAL,
+    'MONEY': SQLDataType.DECIMAL,
+    'SMALLMONEY': SQLDataType.DECIMAL,
+    'BIT': SQLDataType.BIT,
+    'VARCHAR': SQLDataType.VARCHAR,
+    'CHAR': SQLDataType.VARCHAR,
+    'NVARCHAR': SQLDataType.NVARCHAR,
+    'NCHAR': SQLDataType.NVARCHAR,
+    'DATE': SQLDataType.DATE,
+    'DATETIME': SQLDataType.DATETIME,
+    'DATETIME2': SQLDataType.DATETIME,
+    'SMALLDATETIME': SQLDataType.DATETIME,
+    'DATETIMEOFFSET': SQLDataType.DATETIME,
+    'TIME': SQLDataType.TIME,
+}
 
+# (sp_name, frozenset of parameter names) -> (EXEC statement text, canonical name order).
+# Identical SQL text lets pyodbc/SQL Server reuse the prepared statement instead of
+# re-parsing it, and the same parameter set maps to the same text whatever the dict order.
+_SQL_TEMPLATE_CACHE = {}
+
+# Optionally database/schema-qualified procedure name; parts may be [bracketed].
+# Group 1 or 2 is the procedure's own name, as the INFORMATION_SCHEMA views list it.
+_SP_NAME_RE = re.compile(r"(?:(?:\[[^\]]*\]|[^.\[\]]+)\.){0,2}(?:\[([^\]]*)\]|([^.\[\]]+))")
+
+
+def _sp_name_literal(sp_name):
+    """Return sp_name as an N'...' literal for one-shot metadata queries.
+    
+    Inlining the name (instead of binding a ? parameter) lets pyodbc run the
+    query with SQLExecDirect, skipping the prepare/unprepare round-trips.
+    A schema prefix and brackets are stripped so dbo.usp_X and [usp_X] match
+    SPECIFIC_NAME; any other name is compared as-is (and simply isn't found).
+    
+    Raises:
+        ValueError: If sp_name is not a string
+    """
+    if not isinstance(sp_name, str):
+        raise ValueError(f"Invalid stored procedure name: {sp_name!r}")
+    match = _SP_NAME_RE.fullmatch(sp_name)
+    if match:
+        sp_name = match.group(1) if match.group(1) is not None else match.group(2)
+    return "N'" + sp_name.replace("'", "''") + "'"
+
+
+@lru_cache(maxsize=None)
 def get_stored_procedure_parameters(sp_name):
-    """Get parameter metadata for a stored procedure.
+    """Get parameter metadata for a stored procedure (cached per SP name).
+    
+    SP signatures are treated as static for the life of the process; call
+    clear_sp_metadata_cache() after altering a stored procedure.
     
     Args:
         sp_name: Name of the stored procedure
     
     Returns:
-        List of tuples: (PARAMETER_NAME, DATA_TYPE, PARAMETER_MODE)
+        Tuple of tuples: (PARAMETER_NAME, DATA_TYPE, PARAMETER_MODE)
+    
+    Raises:
+        ValueError: If sp_name is not a string
     """
+    name_literal = _sp_name_literal(sp_name)
     with DBSession() as db:
-        query = """
+        query = f"""
         SELECT PARAMETER_NAME, DATA_TYPE, PARAMETER_MODE
         FROM INFORMATION_SCHEMA.PARAMETERS
-        WHERE SPECIFIC_NAME = ?
+        WHERE SPECIFIC_NAME = {name_literal}
         ORDER BY ORDINAL_POSITION
         """
-        return db.execute_query(query, (sp_name,))
+        return tuple(tuple(row) for row in db.execute_query(query))
 
 
 def _build_type_mappings_from_metadata(sp_name):
-    """Build parameter type mappings from SP metadata in the database."""
-    try:
-        param_rows = get_stored_procedure_parameters(sp_name)
-        if not param_rows:
-            logger.warning(f"No parameter metadata found for SP '{sp_name}'")
-            return {}
-        
-        type_mappings = {}
-        for row in param_rows:
-            param_name = row[0]
-            data_type = row[1].upper()
-            
-            # Map SQL Server types to SQLDataType
-            if data_type in ('INT', 'BIGINT', 'SMALLINT', 'TINYINT'):
-                type_mappings[param_name] = SQLDataType.INT
-            elif data_type in ('FLOAT', 'REAL'):
-                type_mappings[param_name] = SQLDataType.FLOAT
-            elif data_type in ('DECIMAL', 'NUMERIC', 'MONEY', 'SMALLMONEY'):
-                type_mappings[param_name] = SQLDataType.DECIMAL
-            elif data_type in ('BIT',):
-                type_mappings[param_name] = SQLDataType.BIT
-            elif data_type in ('VARCHAR', 'CHAR'):
-                type_mappings[param_name] = SQLDataType.VARCHAR
-            elif data_type in ('NVARCHAR', 'NCHAR'):
-                type_mappings[param_name] = SQLDataType.NVARCHAR
-            elif data_type in ('DATE',):
-                type_mappings[param_name] = SQLDataType.DATE
-            elif data_type in ('DATETIME', 'DATETIME2', 'SMALLDATETIME', 'DATETIMEOFFSET'):
-                type_mappings[param_name] = SQLDataType.DATETIME
-            elif data_type in ('TIME',):
-                type_mappings[param_name] = SQLDataType.TIME
-            else:
-                type_mappings[param_name] = data_type
-        
-        logger.debug(f"Built type mappings for SP '{sp_name}': {type_mappings}")
-        return type_mappings
+    """Build parameter type mappings from SP metadata in the database.
     
-    except Exception as e:
-        logger.warning(f"Failed to fetch parameter metadata for SP '{sp_name}': {str(e)}")
+    Raises:
+        Exception: If the metadata query fails (so failures are never cached)
+    """
+    param_rows = get_stored_procedure_parameters(sp_name)
+    if not param_rows:
+        logger.warning("No parameter metadata found for SP '%s'", sp_name)
         return {}
+    
+    type_mappings = {}
+    for row in param_rows:
+        data_type = row[1].upper()
+        # Unmapped type names come from the driver; intern them like the SQLDataType constants
+        type_mappings[row[0]] = _SQL_TYPE_MAP.get(data_type) or sys.intern(data_type)
+    
+    logger.debug("Built type mappings for SP '%s': %s", sp_name, type_mappings)
+    return type_mappings
+
+
+@lru_cache(maxsize=None)
+def _cached_type_mappings(sp_name):
+    """Read-only type mappings for an SP, built once from its metadata."""
+    return MappingProxyType(_build_type_mappings_from_metadata(sp_name))
+
+
+@lru_cache(maxsize=None)
+def _compile_normalization_plan(sp_name):
+    """Per-SP normalization plan: (param_name, normalizer) for every parameter whose type needs one."""
+    return ParameterNormalizer.compile_plan(_cached_type_mappings(sp_name))
+
+
+def clear_sp_metadata_cache():
+    """Drop cached SP parameter metadata (call after CREATE/ALTER PROCEDURE)."""
+    get_stored_procedure_parameters.cache_clear()
+    _cached_type_mappings.cache_clear()
+    _compile_normalization_plan.cache_clear()
 
 
 def list_stored_procedures():
@@ -78,7 +141,8 @@ def list_stored_procedures():
         WHERE ROUTINE_TYPE='PROCEDURE' AND SPECIFIC_NAME LIKE '%group%'
         ORDER BY SPECIFIC_NAME
         """
-        return [row[0] for row in db.execute_query(query)]
+        # Names are collected inside the session; rows are streamed rather than fetched twice
+        return [row[0] for row in db.execute_iter(query)]
 
 
 def run_stored_procedure(sp_name, params=None, type_mappings=None, capture_output_params=False):
@@ -88,77 +152,170 @@ def run_stored_procedure(sp_name, params=None, type_mappings=None, capture_outpu
         sp_name: Name of the stored procedure
         params: Parameters (None, sequence, or dict)
         type_mappings: Optional dict of param_name -> SQL type
-        capture_output_params: If True, return dict with rows and output_params
+        capture_output_params: If True, return dict with rows, output_params and
+            the result set's cursor description
     
     Returns:
-        List of result rows or dict with rows and output_params
+        List of result rows or dict with rows, output_params and description
     """
     with DBSession() as db:
-        if params is None:
-            sql = f"EXEC {sp_name}"
-            result_rows = db.execute_query(sql)
-            return _format_result(result_rows, None, capture_output_params)
-
-        # positional parameters
-        if isinstance(params, (list, tuple)):
-            placeholders = ",".join("?" for _ in params)
-            sql = f"EXEC {sp_name} {placeholders}"
-            result_rows = db.execute_query(sql, params)
-            return _format_result(result_rows, None, capture_output_params)
-
-        # named parameters - normalize before execution
-        if isinstance(params, dict):
-            if type_mappings is None:
-                type_mappings = _build_type_mappings_from_metadata(sp_name)
-            
-            normalized_params = ParameterNormalizer.normalize_parameters(params, type_mappings)
-            logger.info(f"Executing SP '{sp_name}' with {len(normalized_params)} parameters")
-            logger.debug(f"Normalized params: {normalized_params}")
-            
-            names = list(normalized_params.keys())
-            placeholders = ",".join(f"{name}=?" for name in names)
-            sql = f"EXEC {sp_name} {placeholders}"
-            values = [normalized_params[name] for name in names]
-            result_rows = db.execute_query(sql, values)
-            
-            # Extract output params if requested
-            output_params = None
-            if capture_output_params:
-                output_params = db.get_output_params()
-            
-            return _format_result(result_rows, output_params, capture_output_params)
-
-        raise TypeError("params must be None, sequence or dict")
-
-
-def _format_result(rows, output_params, capture_output_params):
+        return run_stored_procedure_with_session(db, sp_name, params, type_mappings, capture_output_params)
+
+
+def run_stored_procedure_with_session(db, sp_name, params=None, type_mappings=None, capture_output_params=False):
+    """Execute a stored procedure on an already open DBSession.
+    
+    Same as run_stored_procedure, but lets several calls share one session
+    (and its connection/cursor); committing is left to the session's owner.
+    
+    Args:
+        db: Open DBSession to execute on
+        sp_name: Name of the stored procedure
+        params: Parameters (None, sequence, or dict)
+        type_mappings: Optional dict of param_name -> SQL type
+        capture_output_params: If True, return dict with rows, output_params and
+            the result set's cursor description
+    
+    Returns:
+        List of result rows or dict with rows, output_params and description
+    """
+    if params is None:
+        sql = f"EXEC {sp_name}"
+        result_rows = db.execute_query(sql)
+        return _format_result(result_rows, None, capture_output_params)
+
+    # positional parameters
+    if isinstance(params, (list, tuple)):
+        placeholders = ",".join("?" for _ in params)
+        sql = f"EXEC {sp_name} {placeholders}"
+        result_rows = db.execute_query(sql, params)
+        return _format_result(result_rows, None, capture_output_params)
+
+    # named parameters - normalize before execution
+    if isinstance(params, dict):
+        sql, values = _prepare_named_call(sp_name, params, type_mappings)
+        result_rows = db.execute_query(sql, values)
+        
+        # Extract output params (and column metadata) if requested
+        output_params = None
+        description = None
+        if capture_output_params:
+            output_params = db.get_output_params()
+            description = db.cursor.description
+        
+        return _format_result(result_rows, output_params, capture_output_params, description)
+
+    raise TypeError("params must be None, sequence or dict")
+
+
+def run_stored_procedure_batch(calls, db=None):
+    """Execute several stored procedures with named parameters in one round-trip.
+    
+    Every call is sent in a single batch, so all of them run even if an earlier
+    one reports a failure status. Each SP must return exactly one result set.
+    
+    Args:
+        calls: List of (sp_name, params_dict) tuples
+        db: Optional open DBSession to execute on (default: a new session)
+    
+    Returns:
+        List of dicts with rows, output_params and description, one per call
+    
+    Raises:
+        RuntimeError: If the batch returns a different number of result sets than calls
+    """
+    statements = []
+    values = []
+    for sp_name, params in calls:
+        sql, call_values = _prepare_named_call(sp_name, params)
+        statements.append(sql)
+        values.extend(call_values)
+    
+    # NOCOUNT is a session setting and pooled/test-transaction connections are reused,
+    # so switch it back off or every later cursor.rowcount on the connection reads -1
+    batch_sql = "SET NOCOUNT ON;\n" + ";\n".join(statements) + ";\nSET NOCOUNT OFF"
+    with (DBSession() if db is None else nullcontext(db)) as db:
+        try:
+            rowsets = db.execute_batch(batch_sql, values)
+        except Exception:
+            # The batch may have stopped before its trailing SET NOCOUNT OFF
+            with suppress(Exception):
+                db.cursor.execute("SET NOCOUNT OFF")
+            raise
+    
+    if len(rowsets) != len(calls):
+        raise RuntimeError(
+            f"Batch of {len(calls)} SP calls returned {len(rowsets)} result sets"
+        )
+    # pyodbc rows carry the description of the result set they came from
+    return [_format_result(rows, None, True, getattr(rows[0], 'cursor_description', None) if rows else None)
+            for rows in rowsets]
+
+
+def _prepare_named_call(sp_name, params, type_mappings=None):
+    """Normalize dict parameters and build the EXEC statement for them.
+    
+    Returns:
+        Tuple of (sql, values)
+    """
+    if type_mappings is not None:
+        normalized_params = ParameterNormalizer.normalize_parameters(params, type_mappings)
+    else:
+        try:
+            plan = _compile_normalization_plan(sp_name)
+        except Exception as e:
+            logger.warning("Failed to fetch parameter metadata for SP '%s': %s", sp_name, e)
+            plan = ()
+        
+        # Untyped parameters pass through unchanged and keep their order
+        normalized_params = dict(params)
+        for param_name, normalizer in plan:
+            if param_name in normalized_params:
+                normalized_params[param_name] = normalizer(normalized_params[param_name])
+    logger.info("Executing SP '%s' with %d parameters", sp_name, len(normalized_params))
+    logger.debug("Normalized params: %s", normalized_params)
+    
+    key = (sp_name, frozenset(normalized_params))
+    template = _SQL_TEMPLATE_CACHE.get(key)
+    if template is None:
+        names = tuple(normalized_params)
+        placeholders = ",".join(f"{name}=?" for name in names)
+        template = _SQL_TEMPLATE_CACHE.setdefault(key, (f"EXEC {sp_name} {placeholders}", names))
+    sql, names = template
+    values = [normalized_params[name] for name in names]
+    return sql, values
+
+
+def _format_result(rows, output_params, capture_output_params, description=None):
     """Format result based on capture_output_params flag."""
     if capture_output_params:
         return {
             'rows': rows,
-            'output_params': output_params or {}
+            'output_params': output_params or {},
+            'description': description
         }
     return rows
 
 
 def get_stored_procedure_details(sp_name):
-    """Get details about a stored procedure."""
+    """Get details about a stored procedure.
+    
+    Raises:
+        ValueError: If sp_name is not a string
+    """
+    name_literal = _sp_name_literal(sp_name)
     with DBSession() as db:
-        check_query = """
-        SELECT COUNT(*)
+        # A single lookup doubles as the existence check
+        query = f"""
+        SELECT TOP 1 SPECIFIC_NAME, ROUTINE_DEFINITION, ROUTINE_TYPE, CREATED, LAST_ALTERED
         FROM INFORMATION_SCHEMA.ROUTINES
-        WHERE SPECIFIC_NAME = ? AND ROUTINE_TYPE = 'PROCEDURE'
+        WHERE SPECIFIC_NAME = {name_literal} AND ROUTINE_TYPE = 'PROCEDURE'
         """
-        exists = db.execute_query(check_query, (sp_name,))[0][0]
+        row = db.execute_one(query)
 
-        if exists:
+        if row is not None:
             print(f"Stored procedure '{sp_name}' exists in the database.")
-            query = """
-            SELECT SPECIFIC_NAME, ROUTINE_DEFINITION, ROUTINE_TYPE, CREATED, LAST_ALTERED
-            FROM INFORMATION_SCHEMA.ROUTINES
-            WHERE SPECIFIC_NAME = ? AND ROUTINE_TYPE = 'PROCEDURE'
-            """
-            return db.execute_query(query, (sp_name,))
+            return [row]
         else:
             print(f"Stored procedure '{sp_name}' does not exist in the database.")
             return None
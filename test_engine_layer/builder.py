@@ -2,12 +2,61 @@
 
 from typing import Dict, Any, List
 import datetime
+import logging
+from database_layer.connection import DBSession
+from test_engine_layer.parameter_manager import extend_context
+
+logger = logging.getLogger('sp_validation')
+
+
+def prewarm_column_cache(table_names: List[str] = None) -> Dict[str, list]:
+    """Load column names for many tables with a single INFORMATION_SCHEMA query.
+    
+    Fills the same cache get_column_names reads, so later lookups for these
+    tables need no further round-trips.
+    
+    Args:
+        table_names: Optional list of tables to load (default: every table in the current schema)
+        
+    Returns:
+        The column cache (table name -> list of column names in ordinal order)
+    """
+    _column_cache = getattr(get_column_names, '_cache', {})
+    if not hasattr(get_column_names, '_cache'):
+        get_column_names._cache = _column_cache
+    
+    query = """
+    SELECT TABLE_NAME, COLUMN_NAME
+    FROM INFORMATION_SCHEMA.COLUMNS
+    WHERE TABLE_SCHEMA = SCHEMA_NAME()
+    """
+    params = []
+    if table_names:
+        table_names = list(dict.fromkeys(table_names))
+        query += f"AND TABLE_NAME IN ({', '.join('?' * len(table_names))})\n"
+        params = table_names
+    query += "ORDER BY TABLE_NAME, ORDINAL_POSITION"
+    
+    try:
+        with DBSession() as db:
+            results = db.execute_query(query, params)
+    except Exception as e:
+        logger.warning(f"Could not prewarm column cache: {e}")
+        return _column_cache
+    
+    loaded = {}
+    for table_name, column_name in results or []:
+        loaded.setdefault(table_name, []).append(column_name)
+    _column_cache.update(loaded)
+    return _column_cache
 
 
 def get_column_names(table_name: str) -> list:
     """Get column names for a table from INFORMATION_SCHEMA (cached).
     
-    Returns list of column names in ordinal order.
+    Returns list of column names in ordinal order. The first miss loads every
+    table in the current schema in one query (see prewarm_column_cache); only
+    tables outside it fall back to a per-table lookup.
     
     Args:
         table_name: Name of the table
@@ -23,8 +72,13 @@ def get_column_names(table_name: str) -> list:
     if table_name in _column_cache:
         return _column_cache[table_name]
     
+    if not getattr(get_column_names, '_prewarmed', False):
+        get_column_names._prewarmed = True
+        prewarm_column_cache()
+        if table_name in _column_cache:
+            return _column_cache[table_name]
+    
     try:
-        from database_layer.connection import DBSession
         with DBSession() as db:
             query = """
             SELECT COLUMN_NAME
@@ -40,6 +94,22 @@ def get_column_names(table_name: str) -> list:
         return []
 
 
+def remember_column_names(table_name: str, col_names: List[str]) -> None:
+    """Record column names already known from a result set in the get_column_names cache.
+    
+    Lets a `SELECT * FROM table` that has already run (and whose cursor description
+    lists every column in order) stand in for a later metadata lookup.
+    
+    Args:
+        table_name: Name of the table
+        col_names: Column names in ordinal order
+    """
+    _column_cache = getattr(get_column_names, '_cache', {})
+    if not hasattr(get_column_names, '_cache'):
+        get_column_names._cache = _column_cache
+    _column_cache.setdefault(table_name, list(col_names))
+
+
 def build_test_context(params: Dict[str, Any], chain_data: Dict = None) -> Dict:
     """Build execution context with dynamic values.
     
@@ -50,17 +120,8 @@ def build_test_context(params: Dict[str, Any], chain_data: Dict = None) -> Dict:
     Returns:
         Context dictionary
     """
-    ctx = {}
-    
-    # Add parameters to context
-    if isinstance(params, dict):
-        for k, v in params.items():
-            name = k.lstrip('@')
-            ctx[name] = v
-    
-    # Add chain data if present
-    if chain_data:
-        ctx.update(chain_data)
+    # Add parameters and chain data (if present) to context
+    ctx = extend_context({}, params, chain_data)
     
     # Add generated values if not present
     if 'generated_team_name' not in ctx:
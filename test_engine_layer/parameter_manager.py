@@ -1,7 +1,54 @@
 """Parameter Manager - Manages parameter formatting and substitution."""
 
+import string
+from collections.abc import Mapping
 from typing import Dict, Any
 
+_formatter = string.Formatter()
+
+# Raw format string -> tuple of (literal, field_name) pieces, or None when the
+# string needs the full str.format machinery (format specs, conversions,
+# attribute/index lookups, positional fields, or invalid syntax)
+_TEMPLATE_CACHE = {}
+
+
+def _parse_template(template: str):
+    """Split a format string into (literal, field_name) pieces for _apply_template."""
+    pieces = []
+    try:
+        for literal, field, spec, conversion in _formatter.parse(template):
+            if field is not None and (spec or conversion or not field.isidentifier()):
+                return None
+            pieces.append((literal, field))
+    except ValueError:
+        return None
+    return tuple(pieces)
+
+
+def _apply_template(template: str, ctx: Dict) -> str:
+    """Equivalent of template.format(**ctx), parsing each template only once.
+    
+    ctx must be a plain dict: a mapping with __missing__ would fill in fields
+    that template.format(**ctx) reports as missing.
+    
+    Raises:
+        KeyError: If a field is missing from ctx
+        ValueError: If the template is not a valid format string
+    """
+    try:
+        pieces = _TEMPLATE_CACHE[template]
+    except KeyError:
+        pieces = _TEMPLATE_CACHE[template] = _parse_template(template)
+    if pieces is None:
+        return template.format(**ctx)
+    
+    parts = []
+    for literal, field in pieces:
+        parts.append(literal)
+        if field is not None:
+            parts.append(format(ctx[field]))
+    return ''.join(parts)
+
 
 def format_dict(d: Dict, ctx: Dict) -> Dict:
     """Return copy of dict with string values formatted using context.
@@ -15,19 +62,34 @@ def format_dict(d: Dict, ctx: Dict) -> Dict:
     """
     if not isinstance(d, dict):
         return d
+    if type(ctx) is not dict:
+        # format(**ctx) only ever saw a plain copy of the context (see _apply_template)
+        ctx = dict(ctx)
     
+    # Nested dicts are walked with an explicit stack instead of recursion.
+    # Values are almost always plain str/dict (JSON templates, loaded test data), so
+    # the exact type check comes first and isinstance only runs for other types.
     formatted = {}
-    for k, v in d.items():
-        if isinstance(v, str):
-            try:
-                formatted[k] = v.format(**ctx)
-            except Exception:
-                # If formatting fails, keep original value
-                formatted[k] = v
-        elif isinstance(v, dict):
-            formatted[k] = format_dict(v, ctx)
-        else:
-            formatted[k] = v
+    stack = [(d, formatted)]
+    while stack:
+        source, target = stack.pop()
+        for k, v in source.items():
+            value_type = type(v)
+            if value_type is str or isinstance(v, str):
+                # Strings without braces come out of str.format unchanged, so skip it
+                if '{' in v or '}' in v:
+                    try:
+                        target[k] = _apply_template(v, ctx)
+                    except Exception:
+                        # If formatting fails, keep original value
+                        target[k] = v
+                else:
+                    target[k] = v
+            elif value_type is dict or isinstance(v, dict):
+                nested = target[k] = {}
+                stack.append((v, nested))
+            else:
+                target[k] = v
     
     return formatted
 
@@ -42,12 +104,25 @@ def make_context(params: Dict, chain_data: Dict = None) -> Dict:
     Returns:
         Context dictionary
     """
-    ctx = {}
+    return extend_context({}, params, chain_data)
+
+
+def extend_context(ctx: Dict, params: Dict = None, chain_data: Dict = None) -> Dict:
+    """Add parameters and chain data to an existing context dict in place.
     
-    if isinstance(params, dict):
+    Parameter names lose their leading '@'; chain data wins over parameters.
+    
+    Args:
+        ctx: Context dictionary to update
+        params: Optional parameter dictionary
+        chain_data: Optional chain execution data
+        
+    Returns:
+        The same ctx, updated
+    """
+    if isinstance(params, Mapping):
         for k, v in params.items():
-            name = k.lstrip('@')
-            ctx[name] = v
+            ctx[k.lstrip('@') if k.startswith('@') else k] = v
     
     if chain_data:
         ctx.update(chain_data)
@@ -2,42 +2,155 @@
 
 import json
 import os
+import re
 import logging
 import datetime
 import traceback
+from contextlib import nullcontext
+from functools import lru_cache
 from typing import Dict, List, Any
 from config.config import DataConfig
 from test_engine_layer.template_transformer import TemplateTransformer
 
 from data_loader_factory import TestDataLoader
 from database_layer.connection import DBSession, get_connection
-from database_layer.procedure_executor import run_stored_procedure
+from database_layer.transaction_manager import get_test_transaction
+from database_layer.procedure_executor import run_stored_procedure, run_stored_procedure_with_session
 from database_layer.chain_executor import SPChainExecutor
 from test_engine_layer.utils import Colors, setup_logging
 from test_engine_layer.parameter_manager import format_dict, make_context
-from test_engine_layer.builder import build_test_context, get_column_names
+from test_engine_layer.builder import build_test_context, get_column_names, remember_column_names
+
+# Optional faster JSON encoder for logging result rows; the standard library is the fallback
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger('sp_validation')
 
+# `SELECT * FROM [schema.]table` with nothing but an optional WHERE/ORDER BY after it:
+# its result columns are exactly the table's columns
+_SELECT_STAR_RE = re.compile(
+    r"\s*SELECT\s+\*\s+FROM\s+(?:\[?\w+\]?\.)?\[?(\w+)\]?\s*(?:WHERE\b|ORDER\s+BY\b|;|$)",
+    re.IGNORECASE
+)
+
+
+@lru_cache(maxsize=256)
+def _unique_column_names(col_names: tuple) -> tuple:
+    """Make a result set's column names usable as distinct keys.
+    
+    Unnamed columns (e.g. COUNT(*)) become column_<position> and repeated names
+    (e.g. a.id, b.id) get a _2, _3, ... suffix, so no value is dropped.
+    """
+    seen = set()
+    unique = []
+    for position, name in enumerate(col_names, 1):
+        base = name or f"column_{position}"
+        candidate = base
+        suffix = 2
+        while candidate in seen:
+            candidate = f"{base}_{suffix}"
+            suffix += 1
+        seen.add(candidate)
+        unique.append(candidate)
+    return tuple(unique)
+
+
+def _row_to_dict(row, col_names: List = None):
+    """Pair a result row's values with its column names.
+    
+    Falls back to the row's own cursor_description (pyodbc rows carry it), and
+    to a plain list of values when no column names are known. Blank or repeated
+    column names are made unique (see _unique_column_names).
+    """
+    if isinstance(row, dict):
+        return row
+    if not col_names:
+        description = getattr(row, 'cursor_description', None)
+        if not description:
+            return list(row)
+        col_names = [desc[0] for desc in description]
+    return dict(zip(_unique_column_names(tuple(col_names)), row))
+
+
+def _row_to_json(row, col_names: List = None) -> str:
+    """Render a result row as JSON for the log (values JSON can't hold are str()'d).
+    
+    orjson and the json fallback are configured to produce identical text:
+    compact separators, non-ASCII left as is, and datetimes passed to str()
+    (e.g. 2024-01-31 13:45:00) rather than orjson's native ISO-8601 form.
+    """
+    row_dict = _row_to_dict(row, col_names)
+    if orjson is not None:
+        return orjson.dumps(row_dict, default=str, option=orjson.OPT_PASSTHROUGH_DATETIME).decode()
+    return json.dumps(row_dict, default=str, ensure_ascii=False, separators=(',', ':'))
+
 
-def _execute_single_test(sp_name: str, parameters: Dict, logger=None):
-    """Execute a single SP test."""
+def _execute_single_test(sp_name: str, parameters: Dict, logger=None, db=None):
+    """Execute a single SP test (on db if given, otherwise on its own session)."""
     if logger is None:
         logger = logging.getLogger('sp_validation')
     
     logger.info(f"Executing {sp_name} (single)...")
     
-    result = run_stored_procedure(sp_name, parameters)
+    if db is not None:
+        result = run_stored_procedure_with_session(db, sp_name, parameters)
+    else:
+        result = run_stored_procedure(sp_name, parameters)
     
     if result:
         logger.info(f"[OK] Results ({len(result)} rows):")
-        for row_idx, row in enumerate(result, 1):
-            logger.info(f"    Row {row_idx}: {row}")
+        # One record for all rows instead of one trip through the handlers per row
+        logger.info("\n".join(f"    Row {row_idx}: {_row_to_json(row)}" for row_idx, row in enumerate(result, 1)))
     else:
         logger.info("[OK] No results returned (expected if SP has no SELECT output)")
 
 
-def _run_sql_list(sql_list: List, label: str = "", context: Dict = None, logger=None) -> List:
+def _run_statement(db, sql: str, params, log) -> tuple:
+    """Execute one SQL statement and log its outcome.
+    
+    Whether the statement returned rows is read from the cursor description after
+    it ran, so e.g. a CTE feeding an UPDATE/DELETE is reported as DML.
+    
+    Args:
+        db: Open DBSession to run on
+        sql: Formatted SQL statement
+        params: Parameter sequence for the statement
+        log: Callable that logs one message
+        
+    Returns:
+        (result_rows, col_names) when the statement produced a result set,
+        (affected_rows, None) otherwise, or (None, None) if it failed
+    """
+    try:
+        db.cursor.execute(sql, params or [])
+        description = db.cursor.description
+        if description is None:
+            affected_rows = db.cursor.rowcount
+            log(f"    -- {affected_rows} row(s) affected --")
+            return (affected_rows, None)
+        
+        rows = db.cursor.fetchall()
+        col_names = [desc[0] for desc in description]
+        
+        # A plain SELECT * already tells us the table's columns
+        select_star = _SELECT_STAR_RE.match(sql)
+        if select_star and col_names:
+            remember_column_names(select_star.group(1), col_names)
+        
+        if rows:
+            log("\n".join(f"    {_row_to_json(r, col_names)}" for r in rows))
+        else:
+            log("    -- no rows returned --")
+        return (rows, col_names)
+    except Exception as e:
+        log(f"    ERROR executing statement: {e}")
+        return (None, None)
+
+
+def _run_sql_list(sql_list: List, label: str = "", context: Dict = None, logger=None, db=None) -> List:
     """Helper to execute a list of SQL statements.
     
     Args:
@@ -45,9 +158,10 @@ def _run_sql_list(sql_list: List, label: str = "", context: Dict = None, logger=
         label: Optional prefix for logs
         context: Dict for string formatting
         logger: Optional logger
+        db: Optional open DBSession to run on (default: a new session)
         
     Returns:
-        List of (result_rows, col_names) tuples
+        List of (result_rows, col_names) tuples, one per entry
     """
     context = context or {}
     if logger is None:
@@ -59,7 +173,8 @@ def _run_sql_list(sql_list: List, label: str = "", context: Dict = None, logger=
     _log_msg(f"\n-- {label} SQL statements --")
     all_results = []
     
-    with DBSession() as db:
+    # Borrow a session only when the caller did not pass one in
+    with (DBSession() if db is None else nullcontext(db)) as db:
         for entry in sql_list:
             if isinstance(entry, (list, tuple)) and len(entry) == 2:
                 sql, params = entry
@@ -73,53 +188,20 @@ def _run_sql_list(sql_list: List, label: str = "", context: Dict = None, logger=
                 formatted = sql
             
             _log_msg(f"SQL: {formatted}")
-            
-            try:
-                sql_upper = formatted.strip().upper()
-                is_query = sql_upper.startswith('SELECT')
-                
-                if is_query:
-                    db.cursor.execute(formatted, params or [])
-                    rows = db.cursor.fetchall()
-                    
-                    col_names = []
-                    try:
-                        if db.cursor.description:
-                            col_names = [desc[0] for desc in db.cursor.description]
-                    except Exception:
-                        pass
-                    
-                    all_results.append((rows, col_names))
-                    
-                    if rows:
-                        for r in rows:
-                            _log_msg(f"    {r}")
-                    else:
-                        _log_msg("    -- no rows returned --")
-                else:
-                    try:
-                        db.cursor.execute(formatted, params or [])
-                        affected_rows = db.cursor.rowcount
-                        all_results.append((affected_rows, None))
-                        _log_msg(f"    -- {affected_rows} row(s) affected --")
-                    except Exception as dml_err:
-                        _log_msg(f"    ERROR executing as DML: {dml_err}")
-                        all_results.append((None, None))
-            except Exception as e:
-                _log_msg(f"    ERROR executing statement: {e}")
-                all_results.append((None, None))
+            all_results.append(_run_statement(db, formatted, params, _log_msg))
     
     _log_msg(f"-- end {label} SQL --\n")
     return all_results
 
 
-def _execute_chain_test(chain_config: List[Dict], context: Dict = None, logger=None) -> Dict:
+def _execute_chain_test(chain_config: List[Dict], context: Dict = None, logger=None, db=None) -> Dict:
     """Execute a chained SP test.
     
     Args:
         chain_config: List of chain step configurations
         context: Execution context
         logger: Optional logger
+        db: Optional open DBSession shared by every step (default: one session per step)
         
     Returns:
         Result dictionary
@@ -130,20 +212,20 @@ def _execute_chain_test(chain_config: List[Dict], context: Dict = None, logger=N
     def _log_msg(msg):
         logger.info(msg)
     
-    import copy
     context = context or {}
     formatted_chain = []
     
     for step in chain_config:
-        step_copy = copy.deepcopy(step)
-        params = step_copy.get('parameters', {})
-        step_copy['parameters'] = format_dict(params, context)
+        # Only 'parameters' is replaced (format_dict returns a fresh dict), and the
+        # executor never mutates a step, so a shallow copy leaves chain_config intact
+        step_copy = dict(step)
+        step_copy['parameters'] = format_dict(step.get('parameters', {}), context)
         formatted_chain.append(step_copy)
     
-    connection = get_connection()
+    connection = db.conn if db is not None else get_connection()
     
     try:
-        executor = SPChainExecutor(connection)
+        executor = SPChainExecutor(connection, session=db)
         executor.set_logger(_log_msg)
         result = executor.execute_chain(formatted_chain)
         
@@ -187,10 +269,35 @@ def _execute_chain_test(chain_config: List[Dict], context: Dict = None, logger=N
         
         return result
     finally:
-        if connection:
+        if connection and db is None:
             connection.close()
 
 
+def _run_case_chain(connection, operation: str, chain_config: List[Dict], execution_context: Dict) -> Dict:
+    """Run one test case's chain with every step on a single DBSession.
+    
+    The session commits when the case succeeds. When the chain reports a failure
+    the work of all its steps is rolled back, so a failed case leaves nothing
+    behind (previously each step committed on its own and earlier steps' rows
+    were kept). Callers must not carry a failed chain's chain_data forward.
+    
+    Args:
+        connection: Database connection handed to the chain executor
+        operation: Operation name used for step filtering (e.g. 'Create')
+        chain_config: List of chain step configurations
+        execution_context: Values carried over from earlier test cases
+        
+    Returns:
+        Chain result dictionary from SPChainExecutor.execute_chain
+    """
+    with DBSession() as db:
+        executor = SPChainExecutor(connection, operation=operation, session=db)
+        result = executor.execute_chain(chain_config, execution_context=execution_context)
+        if not result.get('success', True):
+            db.rollback()
+    return result
+
+
 def run_stored_procedures_from_data(filter_executed: bool = True, filter_test_name: str = None, data_file: str = None) -> Dict[str, Any]:
     """Auto-discovery scaffold framework for test data-driven test execution.
     
@@ -296,7 +403,6 @@ def run_stored_procedures_from_data(filter_executed: bool = True, filter_test_na
         # Step 3: For each module, find its folder and template
         all_results = {}
         # Prefer any test transaction connection (set by pytest fixture) to avoid committing
-        from database_layer.transaction_manager import get_test_transaction
         test_tx = get_test_transaction()
         if test_tx:
             connection = test_tx
@@ -360,15 +466,16 @@ def run_stored_procedures_from_data(filter_executed: bool = True, filter_test_na
                     template_file=specific_template,
                     filter_executed=filter_executed,
                     module_filter=module_name,
-                    filter_test_name=filter_test_name
+                    filter_test_name=filter_test_name,
+                    operation_filter=op
                 )
 
                 if not test_data_for_op or module_name not in test_data_for_op:
                     logger.info(f"    No test cases after filtering for {module_name} / {op}")
                     continue
 
-                # pick only cases belonging to this operation (load_and_transform sets Operation key)
-                op_cases = [c for c in test_data_for_op[module_name] if c.get('Operation') == op]
+                # only cases belonging to this operation are populated (operation_filter)
+                op_cases = test_data_for_op[module_name]
                 logger.info(f"    Loaded {len(op_cases)} case(s) for operation {op}")
                 test_cases.extend(op_cases)
 
@@ -397,11 +504,11 @@ def run_stored_procedures_from_data(filter_executed: bool = True, filter_test_na
                 
                 try:
                     if 'chain_config' in test_case and test_case['chain_config']:
-                        executor = SPChainExecutor(connection, operation=operation)
-                        result = executor.execute_chain(test_case['chain_config'], execution_context=execution_context)
+                        result = _run_case_chain(connection, operation, test_case['chain_config'], execution_context)
                         
-                        # Extract execution context from result if available (for chaining operations)
-                        if isinstance(result, dict):
+                        # Extract execution context from result if available (for chaining operations);
+                        # a failed chain was rolled back, so its IDs no longer exist
+                        if isinstance(result, dict) and result.get('success', True):
                             if result.get('chain_data'):
                                 execution_context.update(result.get('chain_data', {}))
                                 logger.info(f"    Updated execution_context with: {result.get('chain_data', {})}")
@@ -454,7 +561,6 @@ def run_stored_procedures_from_data(filter_executed: bool = True, filter_test_na
                     error_str = str(e)
                     logger.error(f"  ✗ TEST FAILED (Exception): {case_id}")
                     logger.error(f"    Exception: {error_str}")
-                    import traceback
                     logger.debug(traceback.format_exc())
                     module_results.append({
                         'case_id': case_id,
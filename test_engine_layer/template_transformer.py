@@ -3,16 +3,35 @@
 Supports multiple formats (CSV, Excel, JSON, etc) - format auto-detected from file extension.
 """
 
+import copy
 import json
 import logging
 import os
 from typing import Dict, List, Any
 from data_loader_factory import TestDataLoader
+from data_loader_factory.fileLoader import read_json
 from config.config import DataConfig
 
 logger = logging.getLogger('sp_validation')
 
 
+# Absolute template path -> (st_mtime_ns, parsed template)
+_template_cache = {}
+
+
+def _load_template(template_path: str) -> Dict[str, Any]:
+    """Parse a template JSON file, reusing the parsed copy until the file changes.
+    
+    The returned dict is shared between callers and must be treated as read-only
+    (_populate_template deep-copies before filling it in).
+    """
+    mtime = os.stat(template_path).st_mtime_ns
+    cached = _template_cache.get(template_path)
+    if cached is None or cached[0] != mtime:
+        cached = _template_cache[template_path] = (mtime, read_json(template_path))
+    return cached[1]
+
+
 class TemplateTransformer:
     """Transform keyword-driven test data into populated JSON templates.
     
@@ -20,7 +39,7 @@ class TemplateTransformer:
     """
     
     @staticmethod
-    def load_and_transform(data_file: str, template_file: str = None, filter_executed: bool = True, module_filter: str = None, filter_test_name: str = None) -> Dict[str, Any]:
+    def load_and_transform(data_file: str, template_file: str = None, filter_executed: bool = True, module_filter: str = None, filter_test_name: str = None, operation_filter: str = None) -> Dict[str, Any]:
         """Load test data and transform using generic template.
         
         Args:
@@ -32,6 +51,8 @@ class TemplateTransformer:
             filter_executed: If True, only load rows where Executed='Yes'
             module_filter: Optional - only return data for specific module/SP name
             filter_test_name: Optional - only return data for specific test name (for independent test execution)
+            operation_filter: Optional - only return cases for this operation (e.g. 'Create'); other
+                cases are skipped before the template is populated for them
             
         Returns:
             Transformed test data dictionary ready for execution
@@ -59,9 +80,8 @@ class TemplateTransformer:
         # Load test data from file (format and schema auto-detected)
         test_data = TestDataLoader.load(data_file)
         
-        # Load template
-        with open(template_file, 'r', encoding='utf-8') as f:
-            template = json.load(f)
+        # Load template (parsed once per file and reused across calls)
+        template = _load_template(os.path.abspath(template_file))
         
         logger.info(f"Loaded template with {len(template)} modules\n")
         
@@ -87,6 +107,10 @@ class TemplateTransformer:
                     logger.debug(f"Skipping test case {test_case.get('case_id')} (not matching filter: {filter_test_name})")
                     continue
                 
+                # Filter by operation if specified (runner loads one template per operation)
+                if operation_filter and test_case.get('operation', '') != operation_filter:
+                    continue
+                
                 # Populate template with test data values
                 populated_case = TemplateTransformer._populate_template(
                     template.get(module_name, [{}])[0] if module_name in template else {},
@@ -129,8 +153,6 @@ class TemplateTransformer:
         Returns:
             Populated template with values from test data
         """
-        import copy
-        
         # Deep copy to avoid modifying original
         result = copy.deepcopy(template)
         
@@ -1,10 +1,13 @@
 """Utils - Simple logging, formatting, and test data utilities."""
 
 import sys
+import json
 import logging
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Dict
 from config.config import DataConfig
+from data_loader_factory import TestDataLoader
 
 
 class Colors:
@@ -68,8 +71,6 @@ def load_test_data(data_file: str = None) -> Dict:
     Returns:
         Dict of {module_name: [test_case_rows]}
     """
-    from data_loader_factory import TestDataLoader
-    
     if data_file is None:
         data_file = DataConfig.DEFAULT_TEST_DATA_FILE
     
@@ -86,8 +87,18 @@ def get_test_case_ids_by_operation(operation: str, data_file: str = None) -> Lis
     Returns:
         List of enabled test case IDs
     """
+    return list(_enabled_case_ids_by_operation(data_file).get(operation.lower(), ()))
+
+
+@lru_cache(maxsize=None)
+def _enabled_case_ids_by_operation(data_file: str = None) -> Dict[str, tuple]:
+    """Bucket enabled test case IDs by lower-cased operation, once per data file.
+    
+    Test data is already cached by TestDataLoader, so the buckets stay valid for
+    the life of the process.
+    """
     test_data = load_test_data(data_file)
-    test_cases = []
+    buckets = {}
     
     for module_name, cases in test_data.items():
         for row in cases:
@@ -101,10 +112,10 @@ def get_test_case_ids_by_operation(operation: str, data_file: str = None) -> Lis
             else:
                 executed = bool(executed_raw)
             
-            if op.lower() == operation.lower() and executed:
-                test_cases.append(test_name)
+            if executed:
+                buckets.setdefault(op.lower(), []).append(test_name)
     
-    return test_cases
+    return {op: tuple(ids) for op, ids in buckets.items()}
 
 
 def get_module_for_test_case(test_case_id: str, data_file: str = None) -> str:
@@ -202,7 +213,6 @@ def validate_test_configuration(data_file: str = None) -> None:
                 params = row.get('parameters', row.get('test_parameters', {}))
                 if isinstance(params, str):
                     try:
-                        import json
                         params = json.loads(params)
                     except:
                         pass
@@ -1,7 +1,11 @@
 import os
+import queue
 import datetime
 import pytest
 import logging
+from logging.handlers import QueueHandler, QueueListener
+from database_layer.connection import get_connection
+from database_layer.transaction_manager import set_test_transaction, clear_test_transaction
 from test_engine_layer.utils import setup_logging, validate_test_configuration
 from validation_layer import verify_preseed_exists
 
@@ -9,6 +13,27 @@ from validation_layer import verify_preseed_exists
 setup_logging()  # Initialize logger for all tests
 
 
+class BufferedFileHandler(logging.FileHandler):
+    """FileHandler that lets a 64 KB file buffer batch its writes.
+
+    logging.FileHandler flushes after every record; here the buffer is only
+    written out when it fills, on ERROR records, and when the handler is closed.
+    """
+
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=1 << 16,
+                    encoding=self.encoding, errors=self.errors)
+
+    def flush(self):
+        # Called after every emit - leave it to the buffer (close() still writes everything out)
+        pass
+
+    def emit(self, record):
+        super().emit(record)
+        if record.levelno >= logging.ERROR and self.stream:
+            self.stream.flush()
+
+
 def pytest_configure(config):
     """Configure pytest - validate test configuration before any tests run."""
     # Validate test configuration (works with CSV/XLSX/JSON any format)
@@ -49,9 +74,6 @@ def db_transaction(request):
     All DBSession instances used during the test will use the same
     transaction context, ensuring complete isolation.
     """
-    from database_layer.connection import get_connection
-    from database_layer.transaction_manager import set_test_transaction, clear_test_transaction
-    
     # Get a connection for this test
     conn = get_connection()
     set_test_transaction(conn)
@@ -87,6 +109,10 @@ def output_dir(request):
 def setup_execution_logging(request, output_dir):
     """Setup file logging to execution.log for all test output.
     
+    Records are handed to a background QueueListener thread so the test loop
+    never blocks on the disk write, and the file is written in buffered chunks;
+    the listener is stopped (and the queue drained) when the test finishes.
+    
     Parallel-safe: uses pytest-xdist worker ID if available.
     """
     # Get the sp_validation logger (tests use this)
@@ -97,7 +123,7 @@ def setup_execution_logging(request, output_dir):
     
     # Create file handler with worker ID in filename for parallel safety
     log_file = os.path.join(output_dir, f"execution_{worker_id}.log")
-    file_handler = logging.FileHandler(log_file, mode='w', encoding='utf-8')
+    file_handler = BufferedFileHandler(log_file, mode='w', encoding='utf-8')
     file_handler.setLevel(logging.DEBUG)
     
     formatter = logging.Formatter(
@@ -106,13 +132,18 @@ def setup_execution_logging(request, output_dir):
     )
     file_handler.setFormatter(formatter)
     
-    # Add file handler directly to sp_validation logger (not root)
-    test_logger.addHandler(file_handler)
+    # Queue records on the sp_validation logger (not root); the listener writes them to the file
+    log_queue = queue.Queue(-1)
+    queue_handler = QueueHandler(log_queue)
+    listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+    listener.start()
+    test_logger.addHandler(queue_handler)
     
     yield
     
-    file_handler.close()
-    test_logger.removeHandler(file_handler)
+    test_logger.removeHandler(queue_handler)
+    listener.stop()
+    file_handler.close()  # writes out whatever is still buffered
 
 
 @pytest.fixture(autouse=True)
@@ -0,0 +1,152 @@
+"""Unit test configuration - these tests never touch the database.
+
+Shared fakes for the database layer:
+- fake_session(outcomes): an open DBSession stand-in over a scripted FakeCursor
+- fake_db_session(module, outcomes): patch module.DBSession to hand out one fake session
+- fake_pool: patch the connection pool so real DBSessions run on a FakeConnection
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from database_layer import connection, pool
+
+
+@pytest.fixture(autouse=True, scope="session")
+def validate_preseed_data():
+    """Override the session-wide preseed check from tests/conftest.py (no database needed)."""
+    yield
+
+
+class FakeCursor:
+    """Cursor that plays back a scripted outcome per SQL text.
+
+    An outcome is a row count (DML), a (col_names, rows) tuple (result set) or an
+    exception to raise; unscripted SQL affects 0 rows. outcomes may also be a
+    callable (sql, params) -> outcome. pending_sets unread result sets are left
+    for nextset(), which raises nextset_error instead when one is given.
+    """
+
+    def __init__(self, outcomes=None, events=None, pending_sets=0, nextset_error=None):
+        self.outcomes = outcomes if outcomes is not None else {}
+        self.events = events if events is not None else []
+        self.pending_sets = pending_sets
+        self.nextset_error = nextset_error
+        self.executed = []
+        self.description = None
+        self.rowcount = -1
+        self._rows = []
+
+    def execute(self, sql, params=()):
+        params = list(params or [])
+        self.executed.append((sql, params))
+        if callable(self.outcomes):
+            outcome = self.outcomes(sql, params)
+        else:
+            outcome = self.outcomes.get(sql, 0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        if isinstance(outcome, int):
+            self.description, self.rowcount = None, outcome
+        else:
+            col_names, self._rows = outcome
+            self.description, self.rowcount = [(name,) for name in col_names], -1
+        return self
+
+    def fetchall(self):
+        if self.description is None:
+            raise RuntimeError("No results.  Previous SQL was not a query.")
+        return list(self._rows)
+
+    def nextset(self):
+        if self.nextset_error is not None:
+            raise self.nextset_error
+        if self.pending_sets:
+            self.pending_sets -= 1
+            self.events.append('nextset')
+            return True
+        return False
+
+
+class FakeConnection:
+    """Connection that tracks which writes (appended to pending) were committed."""
+
+    def __init__(self, events=None):
+        self.events = events if events is not None else []
+        self.pending = []
+        self.committed = []
+
+    def commit(self):
+        self.events.append('commit')
+        self.committed.extend(self.pending)
+        self.pending = []
+
+    def rollback(self):
+        self.events.append('rollback')
+        self.pending = []
+
+
+class FakeSession:
+    """Stand-in for an open DBSession; query helpers run on its FakeCursor.
+
+    execute_batch answers one (1, 'ok') row set per EXEC, or raises batch_error.
+    """
+
+    def __init__(self, outcomes=None, batch_error=None):
+        self.conn = FakeConnection()
+        self.cursor = FakeCursor(outcomes)
+        self.batch_error = batch_error
+        self.batches = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+    def execute_query(self, query, params=None):
+        self.cursor.execute(query, params)
+        return self.cursor.fetchall() if self.cursor.description else []
+
+    def execute_one(self, query, params=None):
+        rows = self.execute_query(query, params)
+        return rows[0] if rows else None
+
+    def execute_batch(self, query, params=None):
+        self.batches.append(query)
+        if self.batch_error is not None:
+            raise self.batch_error
+        return [[(1, 'ok')] for _ in range(query.count("EXEC"))]
+
+
+@pytest.fixture
+def fake_session():
+    """Factory for FakeSession objects."""
+    return FakeSession
+
+
+@pytest.fixture
+def fake_db_session(monkeypatch):
+    """Patch module.DBSession so every session the module opens is one FakeSession (returned)."""
+    def install(module, outcomes=None, **kwargs):
+        session = FakeSession(outcomes, **kwargs)
+        monkeypatch.setattr(module, 'DBSession', lambda: session)
+        return session
+    return install
+
+
+@pytest.fixture
+def fake_pool(monkeypatch):
+    """Route real DBSessions to one FakeConnection/FakeCursor pair.
+
+    Returns a namespace with conn, cursor and events: the commit/rollback/nextset
+    calls plus 'release' and 'discard' as the session hands the connection back.
+    """
+    events = []
+    conn, cursor = FakeConnection(events), FakeCursor(events=events)
+    monkeypatch.setattr(connection, 'get_test_transaction', lambda: None)
+    monkeypatch.setattr(pool, 'acquire', lambda dsn=None: (conn, cursor))
+    monkeypatch.setattr(pool, 'release', lambda conn, cursor, dsn=None: events.append('release'))
+    monkeypatch.setattr(pool, 'discard', lambda conn, cursor: events.append('discard'))
+    return SimpleNamespace(conn=conn, cursor=cursor, events=events)
@@ -0,0 +1,39 @@
+"""Unit tests for the column-name cache in test_engine_layer.builder."""
+
+import logging
+
+import pytest
+
+from test_engine_layer import builder
+
+
+TABLES = {'user_role': ['id', 'role'], 'userXrole': ['other']}
+
+
+def _information_schema(sql, params):
+    """Per-table column lookups work; the schema-wide prewarm query fails."""
+    if 'TABLE_SCHEMA' in sql:
+        return RuntimeError("INFORMATION_SCHEMA unavailable")
+    return (['COLUMN_NAME'], [(name,) for name in TABLES.get(params[0], [])])
+
+
+@pytest.fixture
+def fake_db(monkeypatch, fake_db_session):
+    for attr in ('_cache', '_prewarmed'):
+        monkeypatch.delattr(builder.get_column_names, attr, raising=False)
+    yield fake_db_session(builder, _information_schema)
+    for attr in ('_cache', '_prewarmed'):
+        if hasattr(builder.get_column_names, attr):
+            delattr(builder.get_column_names, attr)
+
+
+def test_get_column_names_matches_table_name_exactly(fake_db):
+    assert builder.get_column_names('user_role') == ['id', 'role']
+    query, params = fake_db.cursor.executed[-1]
+    assert 'TABLE_NAME = ?' in query and params == ['user_role']
+
+
+def test_prewarm_failure_is_logged(fake_db, caplog):
+    with caplog.at_level(logging.WARNING, logger='sp_validation'):
+        assert builder.prewarm_column_cache() == {}
+    assert "Could not prewarm column cache" in caplog.text
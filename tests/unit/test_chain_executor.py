@@ -0,0 +1,115 @@
+"""Unit tests for step batching in database_layer.chain_executor."""
+
+import pytest
+
+from database_layer import chain_executor
+from database_layer.chain_executor import SPChainExecutor
+
+
+DESCRIPTION = [('intStatus',), ('strstatusschteam',), ('intnewidschteam',)]
+
+
+def _sp_result(sp_name, params):
+    """Successful SP result whose new ID is taken from the @id parameter (default 1)."""
+    if sp_name.endswith('_Fail'):
+        return {'rows': [(0, f'{sp_name} failed', None)], 'description': DESCRIPTION}
+    return {'rows': [(1, 'OK', params.get('@id', 1))], 'description': DESCRIPTION}
+
+
+@pytest.fixture
+def round_trips(monkeypatch):
+    """Record every round-trip as the list of (sp_name, params) it sent."""
+    trips = []
+
+    def run_one(db, sp_name, params=None, type_mappings=None, capture_output_params=False):
+        trips.append([(sp_name, dict(params))])
+        return _sp_result(sp_name, params)
+
+    def run_batch(calls, db=None):
+        trips.append([(sp_name, dict(params)) for sp_name, params in calls])
+        return [_sp_result(sp_name, params) for sp_name, params in calls]
+
+    monkeypatch.setattr(chain_executor, 'run_stored_procedure_with_session', run_one)
+    monkeypatch.setattr(chain_executor, 'run_stored_procedure_batch', run_batch)
+    return trips
+
+
+def _names(trips):
+    return [[sp_name for sp_name, _ in trip] for trip in trips]
+
+
+@pytest.fixture
+def run_chain(fake_session):
+    def run(chain, batch=True):
+        executor = SPChainExecutor(None, batch_independent_steps=batch, session=fake_session())
+        return executor.execute_chain(chain)
+    return run
+
+
+@pytest.mark.parametrize("batch", [False, True])
+def test_null_mappings_are_treated_as_empty(round_trips, run_chain, batch):
+    chain = [
+        {'step': 1, 'sp_name': 'usp_A', 'parameters': {'@id': 5}, 'input_mapping': None, 'output_mapping': None},
+        {'step': 2, 'sp_name': 'usp_B', 'parameters': {}, 'input_mapping': None, 'output_mapping': None},
+    ]
+
+    assert run_chain(chain, batch)['success'] is True
+
+
+def test_independent_steps_share_one_round_trip(round_trips, run_chain):
+    chain = [
+        {'step': 1, 'sp_name': 'usp_A', 'parameters': {'@id': 5}},
+        {'step': 2, 'sp_name': 'usp_B', 'parameters': {}},
+        {'step': 3, 'sp_name': 'usp_C', 'parameters': {}},
+    ]
+
+    result = run_chain(chain)
+
+    assert result['success'] is True
+    assert _names(round_trips) == [['usp_A', 'usp_B', 'usp_C']]
+    assert sorted(result['results']) == ['step_1', 'step_2', 'step_3']
+
+
+def test_step_consuming_a_queued_output_flushes_the_batch_first(round_trips, run_chain):
+    chain = [
+        {'step': 1, 'sp_name': 'usp_A', 'parameters': {'@id': 5}, 'output_mapping': {'@id': 'team_id'}},
+        {'step': 2, 'sp_name': 'usp_B', 'parameters': {'@id': 6}},
+        {'step': 3, 'sp_name': 'usp_C', 'parameters': {}, 'input_mapping': {'@team': 'team_id'}},
+    ]
+
+    result = run_chain(chain)
+
+    assert _names(round_trips) == [['usp_A', 'usp_B'], ['usp_C']]
+    assert round_trips[1][0][1]['@team'] == 5
+    assert result['chain_data'] == {'team_id': 5}
+
+
+def test_batch_is_flushed_before_exceeding_the_parameter_limit(round_trips, run_chain, monkeypatch):
+    monkeypatch.setattr(chain_executor, '_MAX_BATCH_PARAMS', 4)
+    chain = [
+        {'step': 1, 'sp_name': 'usp_A', 'parameters': {'@id': 5, '@name': 'a'}},
+        {'step': 2, 'sp_name': 'usp_B', 'parameters': {}},
+        {'step': 3, 'sp_name': 'usp_C', 'parameters': {}},
+    ]
+
+    run_chain(chain)
+
+    # Every step inherits step 1's two parameters, so only two steps fit in a batch
+    assert _names(round_trips) == [['usp_A', 'usp_B'], ['usp_C']]
+
+
+def test_batch_results_are_mapped_back_to_their_steps(round_trips, run_chain):
+    chain = [
+        {'step': 1, 'sp_name': 'usp_A', 'parameters': {'@id': 5}, 'output_mapping': {'@id': 'team_id'}},
+        {'step': 2, 'sp_name': 'usp_B_Fail', 'parameters': {'@id': 6}},
+        {'step': 3, 'sp_name': 'usp_C', 'parameters': {'@id': 7}},
+    ]
+
+    result = run_chain(chain)
+
+    assert result['success'] is False
+    assert result['failed_step'] == 2
+    assert result['sp_message'] == 'usp_B_Fail failed'
+    assert result['chain_data'] == {'team_id': 5}
+    assert result['partial_results']['step_1']['rows'][0][2] == 5
+    assert result['partial_results']['step_2']['rows'][0][1] == 'usp_B_Fail failed'
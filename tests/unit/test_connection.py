@@ -0,0 +1,35 @@
+"""Unit tests for DBSession transaction handling in database_layer.connection."""
+
+import pyodbc
+import pytest
+
+from database_layer.connection import DBSession
+
+
+def test_clean_exit_drains_pending_results_before_commit(fake_pool):
+    fake_pool.cursor.pending_sets = 2
+
+    with DBSession():
+        pass
+
+    assert fake_pool.events == ['nextset', 'nextset', 'commit', 'release']
+
+
+def test_error_in_pending_results_discards_connection_without_commit(fake_pool):
+    fake_pool.cursor.nextset_error = pyodbc.Error("late error")
+
+    with pytest.raises(pyodbc.Error):
+        with DBSession():
+            pass
+
+    assert fake_pool.events == ['discard']
+
+
+def test_exception_exit_rolls_back_even_if_results_cannot_be_drained(fake_pool):
+    fake_pool.cursor.nextset_error = pyodbc.Error("busy")
+
+    with pytest.raises(RuntimeError):
+        with DBSession():
+            raise RuntimeError("step failed")
+
+    assert fake_pool.events == ['rollback', 'release']
@@ -0,0 +1,72 @@
+"""Unit tests for database_layer.normalizer."""
+
+import re
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from database_layer.normalizer import normalize, SQLDataType, _looks_like_date
+
+
+UTC = timezone.utc
+PLUS_ONE = timezone(timedelta(hours=1))
+PLUS_FOURTEEN = timezone(timedelta(hours=14))
+
+
+def test_aware_datetimes_for_same_instant_keep_their_local_time():
+    # Equal instants hash alike; the formatted value must still follow each value's own zone
+    noon_utc = datetime(2020, 1, 1, 12, tzinfo=UTC)
+    one_pm_plus_one = datetime(2020, 1, 1, 13, tzinfo=PLUS_ONE)
+    assert noon_utc == one_pm_plus_one
+
+    assert normalize('@dt', noon_utc, SQLDataType.DATETIME) == "2020-01-01 12:00:00"
+    assert normalize('@dt', one_pm_plus_one, SQLDataType.DATETIME) == "2020-01-01 13:00:00"
+
+
+def test_aware_datetimes_for_same_instant_keep_their_local_date():
+    late_utc = datetime(2020, 1, 1, 12, tzinfo=UTC)
+    next_day_local = datetime(2020, 1, 2, 2, tzinfo=PLUS_FOURTEEN)
+    assert late_utc == next_day_local
+
+    assert normalize('@d', late_utc, SQLDataType.DATE) == "2020-01-01"
+    assert normalize('@d', next_day_local, SQLDataType.DATE) == "2020-01-02"
+
+
+def test_naive_datetimes_are_formatted():
+    value = datetime(2021, 6, 30, 8, 5, 9, 123456)
+    assert normalize('@dt', value, SQLDataType.DATETIME) == "2021-06-30 08:05:09"
+    assert normalize('@d', value, SQLDataType.DATE) == "2021-06-30"
+
+
+# The regexes _looks_like_date used before it switched to character checks
+_BASELINE_DATE_PATTERNS = [
+    r'^\d{4}-\d{2}-\d{2}',
+    r'^\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}',
+    r'^\d{1,2}/\d{1,2}/\d{2,4}',
+    r'^[A-Za-z]{3}\s+\d{1,2}\s+\d{4}',
+    r'^[A-Za-z]{3}\s+\d{1,2}\s+\d{4}\s+\d{1,2}:\d{2}',
+]
+
+
+def _baseline_looks_like_date(value):
+    value = value.strip()
+    return any(re.match(pattern, value) for pattern in _BASELINE_DATE_PATTERNS)
+
+
+@pytest.mark.parametrize('value', [
+    # ISO dates, with and without a time suffix
+    '2024-01-31', '  2024-01-31  ', '2024-01-31 13:45:00', '2024-01-31T13:45:00.123',
+    '2024-01-31junk', '24-01-31', '2024-1-31', '2024/01/31', '2024-01-3', '2024_01_31',
+    '２０２４-01-31',
+    # Slashed dates: 1-2 digit day/month, 2- and 4-digit years
+    '1/2/99', '01/02/1999', '12/31/2024 11:59PM', '1/2/9', '123/4/2024', '1/234/2024',
+    '1/2/', '/1/2024', '1-2-2024', '12/3/4/5', '1/2/99999',
+    # Month names, with and without a time suffix
+    'Jan 1 1900', 'Dec 30 1995', 'Jan 1 1900 12:00AM', 'jan  01\t2024', 'Sept 1 2024',
+    'Jan 123 1900', 'Jan 1 190', 'Jan1 1900', 'Jan 1 1900x', 'Ja 1 1900', 'Jän 1 1900',
+    'J4n 1 1900', 'Jan\u00a01\u00a01900',
+    # Not dates at all
+    '', ' ', 'hello', '2024', '12345678901', 'Team/Role/Name', 'ABC 12 XYZ1',
+])
+def test_looks_like_date_matches_baseline_regexes(value):
+    assert _looks_like_date(value) == _baseline_looks_like_date(value)
@@ -0,0 +1,80 @@
+"""Unit tests for test_engine_layer.parameter_manager."""
+
+from collections import OrderedDict, defaultdict
+
+import pytest
+from test_engine_layer.builder import build_test_context
+from test_engine_layer.parameter_manager import extend_context, format_dict, make_context
+
+
+def test_format_dict_walks_dict_subclasses():
+    params = OrderedDict(name='{team}', nested=OrderedDict(label='{team}-x'))
+
+    assert format_dict(params, {'team': 'A'}) == {'name': 'A', 'nested': {'label': 'A-x'}}
+
+
+@pytest.mark.parametrize("params", [
+    {'@TeamName': 'A', 'DivisionId': 7},
+    OrderedDict([('@TeamName', 'A'), ('DivisionId', 7)]),
+    defaultdict(str, {'@TeamName': 'A', 'DivisionId': 7}),
+])
+def test_make_context_accepts_any_mapping(params):
+    assert make_context(params) == {'TeamName': 'A', 'DivisionId': 7}
+
+
+def test_extend_context_updates_in_place_and_chain_data_wins():
+    ctx = {'existing': 1}
+    result = extend_context(ctx, OrderedDict([('@id', 1), ('name', 'x')]), {'id': 99})
+
+    assert result is ctx
+    assert ctx == {'existing': 1, 'id': 99, 'name': 'x'}
+
+
+def test_build_test_context_accepts_dict_subclass():
+    ctx = build_test_context(OrderedDict([('@TeamName', 'A')]))
+
+    assert ctx['TeamName'] == 'A'
+    assert 'generated_team_name' in ctx
+
+
+def _baseline_format_dict(d, ctx):
+    """format_dict as it was before templates were cached."""
+    if not isinstance(d, dict):
+        return d
+    formatted = {}
+    for k, v in d.items():
+        if isinstance(v, str):
+            try:
+                formatted[k] = v.format(**ctx)
+            except Exception:
+                formatted[k] = v
+        elif isinstance(v, dict):
+            formatted[k] = _baseline_format_dict(v, ctx)
+        else:
+            formatted[k] = v
+    return formatted
+
+
+CTX = {'team': 'A', 'id': 7, 'price': 1.5, 'items': ['x', 'y'], 'none': None}
+
+
+@pytest.mark.parametrize("value", [
+    'plain', '', '{team}', '{team}-{id}', '{{team}}', '{{{team}}}', '{{', '}}', '{', '}',
+    'a } b', '{missing}', '{team}-{missing}', '{id:03d}', '{price:.2f}', '{team!r}',
+    '{items[0]}', '{team.upper}', '{}', '{0}', '{ team}', '{none}', '{team:>{id}}',
+    7, None, 1.5, ['{team}'], ('{team}',),
+])
+def test_format_dict_matches_baseline(value):
+    d = {'value': value, 'nested': {'value': value, 'deeper': {'value': value}}}
+
+    assert format_dict(d, CTX) == _baseline_format_dict(d, CTX)
+
+
+def test_format_dict_keeps_missing_fields_with_defaultdict_context():
+    ctx = defaultdict(str, team='A')
+
+    assert format_dict({'v': '{team}-{missing}'}, ctx) == {'v': '{team}-{missing}'}
+
+
+def test_format_dict_returns_non_dict_input_unchanged():
+    assert format_dict(['{team}'], CTX) == ['{team}']
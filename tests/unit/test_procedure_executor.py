@@ -0,0 +1,52 @@
+"""Unit tests for database_layer.procedure_executor."""
+
+import pytest
+from database_layer import procedure_executor
+from database_layer.procedure_executor import (
+    _sp_name_literal, get_stored_procedure_details, run_stored_procedure_batch
+)
+
+
+@pytest.fixture(autouse=True)
+def prepared_calls(monkeypatch):
+    monkeypatch.setattr(procedure_executor, '_prepare_named_call',
+                        lambda sp_name, params, type_mappings=None: (f"EXEC {sp_name} @id=?", [params['id']]))
+
+
+def test_batch_switches_nocount_back_off(fake_session):
+    db = fake_session()
+
+    results = run_stored_procedure_batch([('usp_A', {'id': 1}), ('usp_B', {'id': 2})], db=db)
+
+    assert len(results) == 2
+    assert db.batches[0].startswith("SET NOCOUNT ON;")
+    assert db.batches[0].endswith("SET NOCOUNT OFF")
+
+
+def test_failed_batch_resets_nocount(fake_session):
+    db = fake_session(batch_error=RuntimeError("batch failed"))
+
+    with pytest.raises(RuntimeError):
+        run_stored_procedure_batch([('usp_A', {'id': 1})], db=db)
+
+    assert db.cursor.executed == [("SET NOCOUNT OFF", [])]
+
+
+@pytest.mark.parametrize("sp_name, literal", [
+    ('usp_X', "N'usp_X'"),
+    ('dbo.usp_X', "N'usp_X'"),
+    ('[usp X]', "N'usp X'"),
+    ('[dbo].[usp X]', "N'usp X'"),
+    ('MyDb.dbo.usp_X', "N'usp_X'"),
+    ("usp_O'Brien", "N'usp_O''Brien'"),
+    ('a.b.c.d', "N'a.b.c.d'"),
+])
+def test_sp_name_literal_matches_specific_name(sp_name, literal):
+    assert _sp_name_literal(sp_name) == literal
+
+
+def test_details_of_unknown_qualified_name_is_not_found(fake_db_session):
+    db = fake_db_session(procedure_executor)
+
+    assert get_stored_procedure_details('[dbo].[usp Missing]') is None
+    assert "SPECIFIC_NAME = N'usp Missing'" in db.cursor.executed[0][0]
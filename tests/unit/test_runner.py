@@ -0,0 +1,113 @@
+"""Unit tests for test_engine_layer.runner helpers."""
+
+from collections import OrderedDict
+from datetime import date, datetime, time
+from decimal import Decimal
+
+import pytest
+from database_layer import chain_executor
+from test_engine_layer import runner
+from test_engine_layer.runner import _run_case_chain, _row_to_dict, _row_to_json, _run_sql_list
+
+
+CHAIN = [
+    {'step': 1, 'sp_name': 'usp_Step1', 'parameters': {'@name': 'team'}},
+    {'step': 2, 'sp_name': 'usp_Step2', 'parameters': {}},
+]
+
+
+def _fake_sp(step2_outcome):
+    def run(db, sp_name, params=None, type_mappings=None, capture_output_params=False):
+        if sp_name == 'usp_Step2' and step2_outcome == 'raise':
+            raise RuntimeError("step 2 blew up")
+        db.conn.pending.append(sp_name)
+        status = 0 if sp_name == 'usp_Step2' and step2_outcome == 'status' else 1
+        return {'rows': [(status, 'message')], 'output_params': {}, 'description': None}
+    return run
+
+
+@pytest.mark.parametrize("step2_outcome", ['raise', 'status'])
+def test_failed_chain_rolls_back_earlier_steps(monkeypatch, fake_pool, step2_outcome):
+    monkeypatch.setattr(chain_executor, 'run_stored_procedure_with_session', _fake_sp(step2_outcome))
+
+    result = _run_case_chain(None, 'Create', CHAIN, {})
+
+    assert result['success'] is False
+    assert fake_pool.conn.committed == []
+
+
+def test_successful_chain_commits_every_step(monkeypatch, fake_pool):
+    monkeypatch.setattr(chain_executor, 'run_stored_procedure_with_session', _fake_sp('ok'))
+
+    result = _run_case_chain(None, 'Create', CHAIN, {})
+
+    assert result['success'] is True
+    assert fake_pool.conn.committed == ['usp_Step1', 'usp_Step2']
+
+
+@pytest.mark.parametrize("col_names, row, expected", [
+    (['id', 'name'], (1, 'a'), {'id': 1, 'name': 'a'}),
+    (['', '', 'id'], (1, 2, 3), {'column_1': 1, 'column_2': 2, 'id': 3}),
+    (['id', 'id'], (5, 6), {'id': 5, 'id_2': 6}),
+    (['id', 'id', 'id_2'], (1, 2, 3), {'id': 1, 'id_2': 2, 'id_2_2': 3}),
+])
+def test_row_to_dict_keeps_every_value(col_names, row, expected):
+    assert _row_to_dict(row, col_names) == expected
+
+
+def test_row_to_dict_passes_mappings_through():
+    row = OrderedDict(id=1)
+    assert _row_to_dict(row, ['ignored']) is row
+
+
+def test_row_to_dict_without_column_names_returns_values():
+    assert _row_to_dict((1, 2)) == [1, 2]
+
+
+def test_row_to_json_logs_unnamed_columns():
+    assert _row_to_json((2, 4, 3), ['', '', 'id']) == '{"column_1":2,"column_2":4,"id":3}'
+
+
+JSON_ROW = (datetime(2024, 1, 31, 13, 45), date(2024, 1, 31), time(9, 30), Decimal('1.50'),
+            'Zoë', None, True, 1.5)
+JSON_COLS = ['dt', 'd', 't', 'amount', 'name', 'missing', 'flag', 'ratio']
+
+
+def test_row_to_json_formats_values_as_str():
+    assert _row_to_json(JSON_ROW, JSON_COLS) == (
+        '{"dt":"2024-01-31 13:45:00","d":"2024-01-31","t":"09:30:00","amount":"1.50",'
+        '"name":"Zoë","missing":null,"flag":true,"ratio":1.5}'
+    )
+
+
+def test_row_to_json_is_the_same_with_and_without_orjson(monkeypatch):
+    pytest.importorskip('orjson')
+    with_orjson = _row_to_json(JSON_ROW, JSON_COLS)
+    monkeypatch.setattr(runner, 'orjson', None)
+
+    assert _row_to_json(JSON_ROW, JSON_COLS) == with_orjson
+
+
+def test_run_sql_list_reports_cte_dml_as_affected_rows(fake_session):
+    cte_delete = "WITH old AS (SELECT id FROM t) DELETE FROM t WHERE id IN (SELECT id FROM old)"
+    db = fake_session({cte_delete: 3, "SELECT id FROM t": (['id'], [(1,), (2,)])})
+
+    results = _run_sql_list([cte_delete, "SELECT id FROM t"], db=db)
+
+    assert results == [(3, None), ([(1,), (2,)], ['id'])]
+
+
+def test_run_sql_list_reports_failed_statement(fake_session):
+    db = fake_session({"DELETE FROM t": RuntimeError("boom")})
+
+    assert _run_sql_list(["DELETE FROM t"], db=db) == [(None, None)]
+
+
+def test_run_sql_list_reports_each_parameterized_statement(fake_session):
+    insert = "INSERT INTO t (id) VALUES (?)"
+    db = fake_session({insert: 1})
+
+    results = _run_sql_list([(insert, [1]), (insert, [2])], db=db)
+
+    assert results == [(1, None), (1, None)]
+    assert db.cursor.executed == [(insert, [1]), (insert, [2])]
@@ -2,6 +2,7 @@
 
 import os
 import logging
+import pathlib
 from database_layer.connection import get_connection
 
 logger = logging.getLogger('sp_validation')
@@ -28,7 +29,6 @@ def verify_preseed_exists(module_path: str, filename: str) -> None:
         Legacy: data_layer/preseed_data/{filename}
     """
     # Look for preseed SQL files in modularized or legacy locations
-    import pathlib
     project_root = pathlib.Path(__file__).parent.parent
     
     # Try new modularized structure first
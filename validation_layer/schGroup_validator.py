@@ -8,6 +8,11 @@ from typing import Dict, Any, List
 logger = logging.getLogger('sp_validation')
 
 
+def _column_lookup(row: Dict[str, Any]) -> Dict[str, str]:
+    """Map lower-cased column names to the row's actual keys (for case-insensitive access)."""
+    return {k.lower(): k for k in row}
+
+
 def getSchdGrpDetails(scheduling_team_id: int) -> Dict[str, Any]:
     """Fetch the scheduling-team row using hard‑coded SQL."""
     logger.info("[getSchdGrpDetails] Querying team details...")
@@ -64,13 +69,21 @@ def getSchdGrpHistory(scheduling_team_id: int, user_id: int) -> List[Dict[str, A
 
     logger.debug("  Row keys: %s", list(results[0].keys()))
 
+    # every row has the same columns, so resolve their casing once
+    columns = _column_lookup(results[0])
+    hid_col = columns.get('historyid')
+    datetime_col = columns.get('datetime')
+    history_col = columns.get('history')
+    type_col = columns.get('historytype')
+    subtype_col = columns.get('historysubtype')
+
     normalized: List[Dict[str, Any]] = []
     for idx, raw_row in enumerate(results):
         # make a mutable copy
         row = dict(raw_row)
-        hid = row.get('HistoryID') if 'HistoryID' in row else row.get('historyid')
-        datetime_val = row.get('DateTime') if 'DateTime' in row else row.get('datetime')
-        history_text = row.get('History') if 'History' in row else row.get('history', '') or ''
+        hid = row.get(hid_col)
+        datetime_val = row.get(datetime_col)
+        history_text = row.get(history_col) or ''
 
         # heuristics to detect operation type from history text or type fields
         op = None
@@ -81,8 +94,8 @@ def getSchdGrpHistory(scheduling_team_id: int, user_id: int) -> List[Dict[str, A
             op = 'edit'
         else:
             # fall back to explicit type/subtype fields if present
-            ht = (row.get('HistoryType') or row.get('historytype') or '')
-            hst = (row.get('HistorySubType') or row.get('historysubtype') or '')
+            ht = (row.get(type_col) or '')
+            hst = (row.get(subtype_col) or '')
             combined = f"{ht}".lower() + f"/{hst}".lower()
             if 'create' in combined:
                 op = 'create'
@@ -128,7 +141,7 @@ def validateSchdGrpHistoryAction(scheduling_team_id: int, user_id: int, expected
         return False
     
     latest_row = history[0]
-    latest_history_text = latest_row.get('History') if 'History' in latest_row else latest_row.get('history', '')
+    latest_history_text = latest_row.get(_column_lookup(latest_row).get('history'))
     latest_history_text = (latest_history_text or '').lower()
     expected_action_lower = expected_action.lower()
     match = expected_action_lower in latest_history_text